@@ -1,3 +1,5 @@
+import importlib
+
 from . import _legacy as _legacy
 
 __version__ = "3.3.1"
@@ -12,14 +14,19 @@ _cookie_cache = _legacy._cookie_cache
 _cookies_store = _legacy._cookies_store
 
 def _get_cookies(platform: str):
-    if platform in _cookie_cache:
-        return _cookie_cache[platform]
-    entry = _cookies_store.get(platform, {})
-    if isinstance(entry, dict) and "cookies" in entry and isinstance(entry.get("cookies"), dict):
-        cookies = entry["cookies"]
-    else:
-        cookies = entry if isinstance(entry, dict) else {}
-    _cookie_cache[platform] = cookies
-    return cookies
+    return _legacy._get_cookies(platform, _cookies_store)
+
+# OCR / analysis / auth pull in optional heavy dependencies; resolve them on
+# first attribute access (PEP 562) rather than at package import.
+_LAZY_SUBMODULES = ("ocr", "analyzer", "auth")
+
+
+def __getattr__(name: str):
+    if name in _LAZY_SUBMODULES:
+        module = importlib.import_module(f".{name}", __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 del _name
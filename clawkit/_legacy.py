@@ -23,21 +23,26 @@ ClawKit v3.2 - 社交媒体内容提取工具
 
 import re
 import os
+import random
 import sys
 import json
 import html
 import time
 import hashlib
+import functools
 import logging
-import argparse
 import subprocess
 import atexit
+import bisect
+import threading
 import time as _time
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from typing import Optional
-from urllib.parse import urlparse, unquote
+from urllib.parse import urlparse, unquote, quote
 from pathlib import Path
 
 import httpx
@@ -55,6 +60,45 @@ except ImportError:
     HAS_SIGN_ENGINE = False
     logger.debug("签名引擎不可用，使用无签名方案")
 
+# ─── 正则引擎（可选） ─────────────────────────────────────────────────────────
+# google-re2 gives linear-time matching for the `<script>(.*?)</script>` scans over
+# whole HTML pages; fall back to the stdlib engine when it is not installed.
+try:
+    import re2 as _re_script
+    HAS_RE2 = True
+except ImportError:
+    _re_script = re
+    HAS_RE2 = False
+
+# ─── JSON 编解码（可选 orjson 加速） ──────────────────────────────────────────
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+if HAS_ORJSON:
+    def _json_loads(s):
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            # NaN / lone surrogates etc. are only accepted by the stdlib parser
+            return json.loads(s)
+
+    def _json_dumpb(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+    def _json_dumps(obj) -> str:
+        return _json_dumpb(obj).decode()
+else:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+
+    def _json_dumpb(obj) -> bytes:
+        return _json_dumps(obj).encode()
+
 # ─── 数据结构 ───────────────────────────────────────────────────────────────────
 
 @dataclass
@@ -142,6 +186,16 @@ DESKTOP_UA = (
 TIMEOUT = float(os.getenv("CLAWKIT_TIMEOUT", "15.0"))
 MAX_RETRIES = 3
 
+# httpx only speaks HTTP/2 when the h2 package is present (pip install "httpx[http2]").
+try:
+    import h2  # noqa: F401
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+# Idle connections stay warm for a minute so back-to-back scrapes skip the TLS handshake
+POOL_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=60.0)
+
 NETWORK_EXCEPTIONS = (
     httpx.HTTPError,
     httpx.TimeoutException,
@@ -175,40 +229,113 @@ API_ENDPOINTS = {
     },
 }
 
-_cookie_cache: dict[str, dict[str, str]] = {}
+# Page-scraping patterns shared across extractors; compiled once at import.
+# Script-block scans use inline (?s) so the same source compiles under re2 and re.
+_RE_JSONLD = _re_script.compile(r'(?s)<script[^>]*type="application/ld\+json"[^>]*>(.*?)</script>')
+_RE_NEXT_DATA = _re_script.compile(r'(?s)<script\s+id="__NEXT_DATA__"[^>]*>(.*?)</script>')
+_RE_INITIAL_STATE = _re_script.compile(r'(?s)window\.__INITIAL_STATE__\s*=\s*(.*?);?\s*</script>')
+_RE_WINDOW_DATA = _re_script.compile(r'(?s)window\.__data__\s*=\s*(.*?);?\s*</script>')
+_RE_RAW_DATA = _re_script.compile(r'(?s)window\.rawData\s*=\s*(.*?);?\s*</script>')
+_RE_RESULT_LIST = re.compile(r'"resultList"\s*:\s*(\[.*?\])\s*[,}]', re.DOTALL)
+_RE_OG_TITLE = re.compile(r'<meta[^>]*property="og:title"[^>]*content="([^"]*)"')
+_RE_META_TITLE = re.compile(r'<meta[^>]*name="title"[^>]*content="([^"]*)"')
+_RE_OG_DESC = re.compile(r'<meta[^>]*(?:property="og:description"|name="description")[^>]*content="([^"]*)"')
+_RE_OG_VIDEO = re.compile(r'<meta[^>]*property="og:video(?::url)?"[^>]*content="([^"]*)"')
+_RE_OG_IMAGE = re.compile(r'<meta[^>]*property="og:image"[^>]*content="([^"]*)"')
+_RE_URL_SNIFF = re.compile(r'https?://[^\s<>"\']+')
+_RE_HTML_TAG = re.compile(r'<[^>]+>')
+_RE_WEIBO_TOPIC = re.compile(r"#([^#]+)#")
+
+_cookie_cache: dict[str, tuple[dict[str, str], float, float]] = {}  # platform -> (cookies, fresh_until, hard_expire)
+_cookie_refreshing: set[str] = set()
+_cookie_lock = threading.Lock()
+# Seconds a cached cookie entry is fresh; it is then served stale for as long
+# again while a background reload of cookies.json runs.
+COOKIE_TTL = float(os.environ.get("CLAWKIT_COOKIE_TTL", "300"))
 _client_pool: dict[tuple[str, bool], httpx.Client] = {}
-_last_request: dict[str, float] = {}
-_trending_cache: dict[str, tuple[float, list]] = {}
-
-def _load_cookies() -> dict[str, dict]:
-    """Load cookies from ~/.clawkit/cookies.json if exists."""
+_client_pool_lock = threading.Lock()
+_pooled_clients: set[httpx.Client] = set()  # O(1) membership for _release_client
+_next_request: dict[str, float] = {}  # platform -> earliest time.monotonic() for the next request
+_rate_lock = threading.Lock()
+_trending_cache: dict[str, tuple[float, list]] = {}  # platform -> (expires_at, data)
+# Per-entry TTL drawn from this range so entries warmed together expire spread out
+TRENDING_TTL = (240.0, 360.0)
+
+def _load_cookies() -> Optional[dict[str, dict]]:
+    """Load cookies from ~/.clawkit/cookies.json if exists.
+
+    Returns {} when there is no file and None when it cannot be read or
+    parsed, so a reload can tell "no cookies" from "keep what we have".
+    """
     cookie_path = Path.home() / ".clawkit" / "cookies.json"
     if cookie_path.exists():
         try:
             with open(cookie_path) as f:
-                return json.load(f)
-        except HANDLED_EXCEPTIONS as e:
+                data = json.load(f)
+        except (OSError, *HANDLED_EXCEPTIONS) as e:
             logger.warning(f"Failed to load cookies: {e}")
+            return None
+        if not isinstance(data, dict):
+            logger.warning("Failed to load cookies: top level is not an object")
+            return None
+        return data
     return {}
 
-_cookies_store = _load_cookies()
+_cookies_store = _load_cookies() or {}
 
-def _get_cookies(platform: str) -> dict[str, str]:
-    """Get cookies for a platform. Supports both formats:
-    - Simple: {"weibo": {"SUB": "xxx"}}
-    - Auth.py: {"weibo": {"cookies": {"SUB": "xxx"}, "updated_at": "..."}}
-    """
-    if platform in _cookie_cache:
-        return _cookie_cache[platform]
-    entry = _cookies_store.get(platform, {})
+def _cache_cookies(platform: str, store: dict) -> dict[str, str]:
+    """Resolve a platform's cookies from ``store`` and (re)start its TTL."""
+    entry = store.get(platform, {})
     if isinstance(entry, dict) and "cookies" in entry and isinstance(entry.get("cookies"), dict):
         cookies = entry["cookies"]
     else:
         cookies = entry if isinstance(entry, dict) else {}
-    _cookie_cache[platform] = cookies
+    fresh_until = _time.monotonic() + COOKIE_TTL
+    _cookie_cache[platform] = (cookies, fresh_until, fresh_until + COOKIE_TTL)
     return cookies
 
 
+def _refresh_cookies(platform: str, store: dict) -> None:
+    try:
+        fresh = _load_cookies()
+        if fresh is not None:
+            # Update in place so the package-level alias of the store stays valid.
+            _cookies_store.update(fresh)
+            for key in [k for k in _cookies_store if k not in fresh]:
+                _cookies_store.pop(key, None)
+        # On a failed reload the previous cookies stay and only the TTL restarts
+        _cache_cookies(platform, store)
+    finally:
+        with _cookie_lock:
+            _cookie_refreshing.discard(platform)
+
+
+def _get_cookies(platform: str, store: Optional[dict] = None) -> dict[str, str]:
+    """Get cookies for a platform. Supports both formats:
+    - Simple: {"weibo": {"SUB": "xxx"}}
+    - Auth.py: {"weibo": {"cookies": {"SUB": "xxx"}, "updated_at": "..."}}
+
+    Entries stay fresh for ``COOKIE_TTL`` seconds. After that the stale value
+    is still returned while cookies.json is reloaded on a daemon thread, so a
+    request never waits on the disk; reads never extend an entry's lifetime.
+    """
+    if store is None:
+        store = _cookies_store
+    cached = _cookie_cache.get(platform)
+    if cached is not None:
+        cookies, fresh_until, hard_expire = cached
+        now = _time.monotonic()
+        if now >= fresh_until:
+            with _cookie_lock:
+                start = platform not in _cookie_refreshing
+                _cookie_refreshing.add(platform)
+            if start:
+                threading.Thread(target=_refresh_cookies, args=(platform, store), daemon=True).start()
+        if now < hard_expire:
+            return cookies
+    return _cache_cookies(platform, store)
+
+
 def _headers(mobile: bool = True, platform: str = "") -> dict[str, str]:
     return {
         "User-Agent": MOBILE_UA if mobile else DESKTOP_UA,
@@ -218,14 +345,22 @@ def _headers(mobile: bool = True, platform: str = "") -> dict[str, str]:
 
 def _get_client(platform: str = "", mobile: bool = True) -> httpx.Client:
     key = (platform, mobile)
-    if key not in _client_pool:
-        _client_pool[key] = httpx.Client(
-            follow_redirects=True,
-            timeout=TIMEOUT,
-            headers=_headers(mobile, platform),
-            cookies=_get_cookies(platform) or None,
-        )
-    return _client_pool[key]
+    client = _client_pool.get(key)
+    if client is None:
+        # batch_extract workers share the pool; build each client only once
+        with _client_pool_lock:
+            client = _client_pool.get(key)
+            if client is None:
+                client = _client_pool[key] = httpx.Client(
+                    follow_redirects=True,
+                    timeout=TIMEOUT,
+                    headers=_headers(mobile, platform),
+                    cookies=_get_cookies(platform) or None,
+                    http2=HAS_HTTP2,
+                    limits=POOL_LIMITS,
+                )
+                _pooled_clients.add(client)
+    return client
 
 
 def _close_clients() -> None:
@@ -246,7 +381,7 @@ def _release_client(client: httpx.Client) -> None:
     - Pooled clients are managed globally and must stay open until atexit.
     - Ad-hoc clients (created directly via httpx.Client) should be closed here.
     """
-    if client not in _client_pool.values():
+    if client not in _pooled_clients:
         try:
             client.close()
         except HANDLED_EXCEPTIONS:
@@ -254,22 +389,25 @@ def _release_client(client: httpx.Client) -> None:
 
 
 def _rate_limit(platform: str, min_interval: float = 0.5) -> None:
-    now = _time.time()
-    last = _last_request.get(platform, 0)
-    wait = max(0, min_interval - (now - last))
-    if wait > 0:
-        _time.sleep(wait)
-    _last_request[platform] = _time.time()
-
-
-def _cached_trending(platform: str, fetch_fn) -> list:
+    # Reserve a slot under the lock and sleep outside it: concurrent batch
+    # workers get spaced min_interval apart instead of all waking together.
+    # Monotonic clock, so wall-clock adjustments cannot stretch or skip waits.
+    with _rate_lock:
+        now = _time.monotonic()
+        slot = max(now, _next_request.get(platform, 0.0))
+        _next_request[platform] = slot + min_interval
+    if slot > now:
+        _time.sleep(slot - now)
+
+
+def _cached_trending(platform: str, fetch_fn, ttl: float | tuple[float, float] = TRENDING_TTL) -> list:
+    # Expiry is fixed at insert and never extended by reads.
     now = time.time()
-    if platform in _trending_cache:
-        ts, data = _trending_cache[platform]
-        if now - ts < 300:
-            return data
+    cached = _trending_cache.get(platform)
+    if cached is not None and now < cached[0]:
+        return cached[1]
     data = fetch_fn()
-    _trending_cache[platform] = (now, data)
+    _trending_cache[platform] = (now + (random.uniform(*ttl) if isinstance(ttl, tuple) else ttl), data)
     return data
 
 def _request_with_retry(client: httpx.Client, method: str, url: str, platform: str = "", **kwargs) -> httpx.Response:
@@ -304,31 +442,44 @@ def _safe_int(v) -> int:
     if isinstance(v, float):
         return int(v)
     if isinstance(v, str):
-        v = v.replace(",", "").replace("+", "").strip()
-        if "亿" in v:
-            v = v.replace("亿", "")
-            try:
-                return int(float(v) * 100000000)
-            except ValueError:
-                return 0
-        if "万" in v:
-            v = v.replace("万", "")
-            try:
-                return int(float(v) * 10000)
-            except ValueError:
-                return 0
+        # Most APIs send plain digit strings; "1.2万"-style display counts repeat
+        # across a page, so the slower parse is memoized.
+        if v.isdigit() and v.isascii():
+            return int(v)
+        return _parse_count(v)
+    return 0
+
+@functools.lru_cache(maxsize=4096)
+def _parse_count(v: str) -> int:
+    v = v.replace(",", "").replace("+", "").strip()
+    if "亿" in v:
+        v = v.replace("亿", "")
         try:
-            return int(float(v))
+            return int(float(v) * 100000000)
         except ValueError:
             return 0
-    return 0
+    if "万" in v:
+        v = v.replace("万", "")
+        try:
+            return int(float(v) * 10000)
+        except ValueError:
+            return 0
+    try:
+        return int(float(v))
+    except ValueError:
+        return 0
+
+_NUM_THRESHOLDS = (10000, 100000000)
+_NUM_UNITS = (("", 1), ("万", 10000), ("亿", 100000000))
 
+@functools.lru_cache(maxsize=4096, typed=True)
 def _fmt_num(n: int) -> str:
-    if n >= 100000000:
-        return f"{n/100000000:.1f}亿"
-    if n >= 10000:
-        return f"{n/10000:.1f}万"
-    return str(n)
+    # Stat values repeat heavily (0, small counts) across a batch of results
+    i = bisect.bisect_right(_NUM_THRESHOLDS, n)
+    if not i:
+        return str(n)
+    suffix, unit = _NUM_UNITS[i]
+    return f"{n/unit:.1f}{suffix}"
 
 def _ts_to_iso(ts) -> str:
     """Convert Unix timestamp to ISO string."""
@@ -340,29 +491,73 @@ def _ts_to_iso(ts) -> str:
         pass
     return ""
 
+def _dig(d, *keys, default=""):
+    """Nested dict lookup without allocating empty dicts; non-dict levels yield default."""
+    for k in keys:
+        d = d.get(k) if isinstance(d, dict) else None
+        if d is None:
+            return default
+    return d
+
+def _trunc(s: str, n: int, ellipsis: str = "...") -> str:
+    return s if len(s) <= n else s[:n] + ellipsis
+
+def _unescape(s: str) -> str:
+    """html.unescape, skipped for the common entity-free case."""
+    return html.unescape(s) if "&" in s else s
+
+
+def _strip_tags(s: str, limit: Optional[int] = None) -> str:
+    """Drop HTML tags; with ``limit``, equal to the full strip cut to that length
+    but stops scanning once enough text is collected (long Zhihu answers)."""
+    if limit is None:
+        return _RE_HTML_TAG.sub('', s)
+    parts, size, pos = [], 0, 0
+    for m in _RE_HTML_TAG.finditer(s):
+        piece = s[pos:m.start()]
+        parts.append(piece)
+        size += len(piece)
+        pos = m.end()
+        if size >= limit:
+            return "".join(parts)[:limit]
+    parts.append(s[pos:])
+    return "".join(parts)[:limit]
+
 # ─── 平台识别 ──────────────────────────────────────────────────────────────────
 
+_PLATFORM_DOMAINS = {
+    "douyin.com": "douyin", "iesdouyin.com": "douyin",
+    "xiaohongshu.com": "xiaohongshu", "xhslink.com": "xiaohongshu", "xhs.cn": "xiaohongshu",
+    "bilibili.com": "bilibili", "b23.tv": "bilibili",
+    "weibo.com": "weibo", "weibo.cn": "weibo",
+    "kuaishou.com": "kuaishou", "gifshow.com": "kuaishou",
+    "zhihu.com": "zhihu",
+    "youtube.com": "youtube", "youtu.be": "youtube",
+    "twitter.com": "twitter", "x.com": "twitter",
+    "goofish.com": "goofish", "xianyu.com": "goofish",
+}
+
+# One anchored pass over scheme, optional userinfo and host: the known domain
+# must be the whole host or follow a "." and be followed by port/path/end.
+_PLATFORM_URL_RE = re.compile(
+    r"https?://(?:[^/?#@]*@)?(?:[^/?#:@]*\.)?("
+    + "|".join(re.escape(d) for d in sorted(_PLATFORM_DOMAINS, key=len, reverse=True))
+    + r")(?::\d*)?(?:[/?#]|\Z)",
+    re.IGNORECASE,
+)
+
 def detect_platform(url: str) -> str:
     if not isinstance(url, str) or not url.strip() or not url.startswith(("http://", "https://")):
         raise ValueError(f"无效URL: {url}")
-    u = url.lower()
-    if any(k in u for k in ["douyin.com", "iesdouyin.com"]):
-        return "douyin"
-    if any(k in u for k in ["xiaohongshu.com", "xhslink.com", "xhs.cn"]):
-        return "xiaohongshu"
-    if any(k in u for k in ["bilibili.com", "b23.tv"]):
-        return "bilibili"
-    if any(k in u for k in ["weibo.com", "weibo.cn"]):
-        return "weibo"
-    if any(k in u for k in ["kuaishou.com", "gifshow.com"]):
-        return "kuaishou"
-    if any(k in u for k in ["zhihu.com"]):
-        return "zhihu"
-    if any(k in u for k in ["youtube.com", "youtu.be"]):
-        return "youtube"
-    if any(k in u for k in ["twitter.com", "x.com", "nitter"]):
+    m = _PLATFORM_URL_RE.match(url)
+    if m:
+        return _PLATFORM_DOMAINS[m.group(1).lower()]
+    parts = urlparse(url)
+    host = parts.hostname or ""
+    # Not plain domain suffixes: any nitter mirror, and the legacy 闲鱼 item path.
+    if "nitter" in host:
         return "twitter"
-    if any(k in u for k in ["goofish.com", "xianyu.com", "2.taobao.com/item"]):
+    if host == "2.taobao.com" and parts.path.startswith("/item"):
         return "goofish"
     raise ValueError(f"无法识别平台: {url}")
 
@@ -377,8 +572,8 @@ class BaseExtractor(ABC):
     def extract(self, url: str) -> ExtractResult:
         ...
 
-    def fetch_comments(self, content_id: str, cursor: int = 0, count: int = 20) -> list[Comment]:
-        """Override in subclasses that support comments."""
+    def fetch_comments(self, content_id: str, cursor: int = 0, count: int = 20, max_pages: int = 1) -> list[Comment]:
+        """Override in subclasses that support comments. Single-page APIs may ignore max_pages."""
         return []
 
     def trending(self) -> list[dict]:
@@ -495,7 +690,7 @@ class DouyinExtractor(BaseExtractor):
         if not m:
             raise ValueError("抖音: 无法从页面提取数据")
 
-        router = json.loads(m.group(1).strip())
+        router = _json_loads(m.group(1).strip())
         if not isinstance(router, dict):
             raise ValueError("抖音: router 数据格式异常")
         loader = router.get("loaderData", {})
@@ -705,7 +900,7 @@ class DouyinExtractor(BaseExtractor):
             m = re.search(r"window\._ROUTER_DATA\s*=\s*(.*?)</script>", resp.text, re.DOTALL)
             if not m:
                 return []
-            router = json.loads(m.group(1).strip())
+            router = _json_loads(m.group(1).strip())
             loader = router.get("loaderData", {})
             related = []
             for key in loader:
@@ -785,7 +980,7 @@ class XiaohongshuExtractor(BaseExtractor):
             raise ValueError("小红书: 无法从页面提取数据")
 
         raw = m.group(1).strip().replace("undefined", "null")
-        state = json.loads(raw)
+        state = _json_loads(raw)
 
         note_data = None
         # Mobile structure
@@ -989,7 +1184,7 @@ class XiaohongshuExtractor(BaseExtractor):
                 logger.warning(f"小红书评论解析失败: {e}")
         return comments
 
-    def fetch_comments(self, note_id: str, cursor: int = 0, count: int = 20) -> list[Comment]:
+    def fetch_comments(self, note_id: str, cursor: int = 0, count: int = 20, max_pages: int = 1) -> list[Comment]:
         """Fetch XHS comments via API with signing."""
         if not HAS_SIGN_ENGINE:
             logger.warning("小红书评论API需要签名引擎（sign_engine.py）")
@@ -1445,7 +1640,7 @@ class WeiboExtractor(BaseExtractor):
                     resp = client.get(api_url, timeout=TIMEOUT)
             if resp.status_code != 200:
                 return None
-            data = resp.json()
+            data = _json_loads(resp.content)
             if not data or ("text_raw" not in data and "text" not in data):
                 return None
             return self._parse_weibo_data(data, url, weibo_id)
@@ -1476,7 +1671,7 @@ class WeiboExtractor(BaseExtractor):
                 m = re.search(r'gen_callback\((.*?)\)', resp.text)
             if not m:
                 return {}
-            data = json.loads(m.group(1))
+            data = _json_loads(m.group(1))
             tid = data.get("data", {}).get("tid", "")
             if not tid:
                 return {}
@@ -1490,7 +1685,7 @@ class WeiboExtractor(BaseExtractor):
             m = re.search(r'cross_domain\((.*?)\)', resp.text)
             if not m:
                 return {}
-            data = json.loads(m.group(1))
+            data = _json_loads(m.group(1))
             sub = data.get("data", {}).get("sub", "")
             subp = data.get("data", {}).get("subp", "")
             if sub:
@@ -1510,7 +1705,7 @@ class WeiboExtractor(BaseExtractor):
             try:
                 resp = client.get(f"https://m.weibo.cn/statuses/show?id={weibo_id}", timeout=TIMEOUT)
                 if resp.status_code == 200:
-                    result = resp.json()
+                    result = _json_loads(resp.content)
                     data = result.get("data", {})
                     if data and data.get("text"):
                         _release_client(client)
@@ -1538,7 +1733,7 @@ class WeiboExtractor(BaseExtractor):
 
                 m = re.search(r'var \$render_data\s*=\s*(\[.*?\])\[0\]', page, re.DOTALL)
                 if m:
-                    render_data = json.loads(m.group(1))
+                    render_data = _json_loads(m.group(1))
                     if render_data and isinstance(render_data, list) and render_data[0]:
                         data = render_data[0].get("status", {})
                         if data:
@@ -1557,8 +1752,8 @@ class WeiboExtractor(BaseExtractor):
         """Parse weibo data from either API."""
         text_raw = data.get("text_raw", "") or data.get("text", "")
         # Clean HTML
-        text_clean = re.sub(r'<[^>]+>', '', text_raw)
-        text_clean = html.unescape(text_clean).strip()
+        text_clean = _RE_HTML_TAG.sub('', text_raw)
+        text_clean = _unescape(text_clean).strip()
 
         user = data.get("user", {})
         author = Author(
@@ -1622,7 +1817,7 @@ class WeiboExtractor(BaseExtractor):
                 if v_url:
                     media.append(MediaItem(url=v_url, type="video"))
 
-        tags = re.findall(r"#([^#]+)#", text_raw)
+        tags = _RE_WEIBO_TOPIC.findall(text_raw)
 
         # Location
         location = ""
@@ -1652,7 +1847,7 @@ class WeiboExtractor(BaseExtractor):
             resp = _request_with_retry(client, "GET",
                 "https://weibo.com/ajax/side/hotSearch",
                 headers={"Referer": "https://weibo.com/", "X-Requested-With": "XMLHttpRequest"})
-            data = resp.json()
+            data = _json_loads(resp.content)
             realtime = data.get("data", {}).get("realtime", [])
             results = []
             for i, item in enumerate(realtime, 1):
@@ -1742,7 +1937,7 @@ class ZhihuExtractor(BaseExtractor):
         m = re.search(r'<script\s+id="js-initialData"[^>]*>(.*?)</script>', page, re.DOTALL)
         if m:
             try:
-                initial_data = json.loads(m.group(1))
+                initial_data = _json_loads(m.group(1))
                 return self._parse_initial_data(initial_data, content_type, content_id, orig_url)
             except (json.JSONDecodeError, KeyError) as e:
                 logger.warning(f"知乎 initialData 解析失败: {e}")
@@ -1760,13 +1955,13 @@ class ZhihuExtractor(BaseExtractor):
             article = articles.get(content_id, {})
             if not article:
                 raise ValueError("知乎: 文章数据未找到")
-            content = re.sub(r'<[^>]+>', '', article.get("content", ""))
+            content = _strip_tags(article.get("content", ""), 500)
             author_data = article.get("author", {})
             create_time = _ts_to_iso(article.get("created", 0))
             return ExtractResult(
                 platform="zhihu", url=url,
                 title=article.get("title", ""),
-                description=content[:500],
+                description=content,
                 author=Author(
                     nickname=author_data.get("name", ""),
                     uid=author_data.get("urlToken", ""),
@@ -1785,14 +1980,14 @@ class ZhihuExtractor(BaseExtractor):
             answer = answers.get(content_id, {})
             if not answer:
                 raise ValueError("知乎: 回答数据未找到")
-            content = re.sub(r'<[^>]+>', '', answer.get("content", ""))
+            content = _strip_tags(answer.get("content", ""), 500)
             author_data = answer.get("author", {})
             question = answer.get("question", {})
             create_time = _ts_to_iso(answer.get("createdTime", 0))
             return ExtractResult(
                 platform="zhihu", url=url,
                 title=question.get("title", ""),
-                description=content[:500],
+                description=content,
                 author=Author(
                     nickname=author_data.get("name", ""),
                     uid=author_data.get("urlToken", ""),
@@ -1811,11 +2006,11 @@ class ZhihuExtractor(BaseExtractor):
             question = questions.get(content_id, {})
             if not question:
                 raise ValueError("知乎: 问题数据未找到")
-            detail = re.sub(r'<[^>]+>', '', question.get("detail", ""))
+            detail = _strip_tags(question.get("detail", ""), 500)
             return ExtractResult(
                 platform="zhihu", url=url,
                 title=question.get("title", ""),
-                description=detail[:500],
+                description=detail,
                 stats=Stats(
                     views=question.get("visitCount", 0),
                     comments=question.get("answerCount", 0),
@@ -1839,18 +2034,18 @@ class ZhihuExtractor(BaseExtractor):
                 api = f"https://www.zhihu.com/api/v4/questions/{content_id}?include=detail,answer_count,follower_count,visit_count"
 
             resp = _request_with_retry(client, "GET", api)
-            data = resp.json()
+            data = _json_loads(resp.content)
 
             if "error" in data:
                 raise ValueError(f"知乎 API 错误: {data['error'].get('message', '')}")
 
             if content_type == "article":
-                content = re.sub(r'<[^>]+>', '', data.get("content", ""))
+                content = _strip_tags(data.get("content", ""), 500)
                 author_data = data.get("author", {})
                 return ExtractResult(
                     platform="zhihu", url=url,
                     title=data.get("title", ""),
-                    description=content[:500],
+                    description=content,
                     author=Author(nickname=author_data.get("name", ""),
                                   uid=author_data.get("url_token", "")),
                     stats=Stats(likes=data.get("voteup_count", 0),
@@ -1858,13 +2053,13 @@ class ZhihuExtractor(BaseExtractor):
                     raw_id=content_id,
                 )
             elif content_type == "answer":
-                content = re.sub(r'<[^>]+>', '', data.get("content", ""))
+                content = _strip_tags(data.get("content", ""), 500)
                 author_data = data.get("author", {})
                 question = data.get("question", {})
                 return ExtractResult(
                     platform="zhihu", url=url,
                     title=question.get("title", ""),
-                    description=content[:500],
+                    description=content,
                     author=Author(nickname=author_data.get("name", ""),
                                   uid=author_data.get("url_token", "")),
                     stats=Stats(likes=data.get("voteup_count", 0),
@@ -1875,7 +2070,7 @@ class ZhihuExtractor(BaseExtractor):
                 return ExtractResult(
                     platform="zhihu", url=url,
                     title=data.get("title", ""),
-                    description=re.sub(r'<[^>]+>', '', data.get("detail", "")),
+                    description=_strip_tags(data.get("detail", "")),
                     stats=Stats(views=data.get("visit_count", 0),
                                 comments=data.get("answer_count", 0)),
                     tags=[t.get("name", "") for t in data.get("topics", [])],
@@ -1898,7 +2093,7 @@ class ZhihuExtractor(BaseExtractor):
             # Use mobile API (no auth required)
             resp = _request_with_retry(client, "GET",
                 "https://api.zhihu.com/topstory/hot-lists/total?limit=50")
-            data = resp.json()
+            data = _json_loads(resp.content)
             items = data.get("data", [])
             results = []
             for i, item in enumerate(items, 1):
@@ -2002,16 +2197,16 @@ class KuaishouExtractor(BaseExtractor):
             state = None
             raw = m.group(1).strip()
             try:
-                state = json.loads(raw)
+                state = _json_loads(raw)
             except json.JSONDecodeError:
                 # Kuaishou may truncate/corrupt JSON; try to salvage by trimming
                 for trim in range(1, min(200, len(raw))):
                     try:
-                        state = json.loads(raw[:-trim] + "}")
+                        state = _json_loads(raw[:-trim] + "}")
                         break
                     except json.JSONDecodeError:
                         try:
-                            state = json.loads(raw[:-trim] + "}}")
+                            state = _json_loads(raw[:-trim] + "}}")
                             break
                         except json.JSONDecodeError:
                             continue
@@ -2062,7 +2257,7 @@ class KuaishouExtractor(BaseExtractor):
             if m:
                 try:
                     raw = m.group(1).strip().replace("undefined", "null")
-                    state = json.loads(raw)
+                    state = _json_loads(raw)
                     video_info = state.get("data", [{}])[0] if isinstance(state.get("data"), list) else state.get("data", {})
                     if isinstance(video_info, dict):
                         title = video_info.get("caption", "") or video_info.get("title", "")
@@ -2072,28 +2267,28 @@ class KuaishouExtractor(BaseExtractor):
 
         # Fallback: meta tags (always try to fill missing fields)
         if not title:
-            m_title = re.search(r'<meta[^>]*property="og:title"[^>]*content="([^"]*)"', page)
+            m_title = _RE_OG_TITLE.search(page)
             if not m_title:
-                m_title = re.search(r'<meta[^>]*name="title"[^>]*content="([^"]*)"', page)
+                m_title = _RE_META_TITLE.search(page)
             if m_title:
-                title = html.unescape(m_title.group(1))
+                title = _unescape(m_title.group(1))
         if not description:
-            m_desc = re.search(r'<meta[^>]*(?:property="og:description"|name="description")[^>]*content="([^"]*)"', page)
+            m_desc = _RE_OG_DESC.search(page)
             if m_desc:
-                description = html.unescape(m_desc.group(1))
+                description = _unescape(m_desc.group(1))
         if not media:
-            m_video = re.search(r'<meta[^>]*property="og:video(?::url)?"[^>]*content="([^"]*)"', page)
+            m_video = _RE_OG_VIDEO.search(page)
             if m_video:
-                media.append(MediaItem(url=html.unescape(m_video.group(1)), type="video"))
+                media.append(MediaItem(url=_unescape(m_video.group(1)), type="video"))
         if not cover_url:
-            m_image = re.search(r'<meta[^>]*property="og:image"[^>]*content="([^"]*)"', page)
+            m_image = _RE_OG_IMAGE.search(page)
             if m_image:
-                cover_url = html.unescape(m_image.group(1))
+                cover_url = _unescape(m_image.group(1))
         if not author.nickname:
             # Try <title> tag: "xxx的作品 - 快手"
             m_author = re.search(r'<title[^>]*>([^<]*?)的作品', page)
             if m_author:
-                author.nickname = html.unescape(m_author.group(1).strip())
+                author.nickname = _unescape(m_author.group(1).strip())
 
         return ExtractResult(
             platform="kuaishou",
@@ -2117,17 +2312,23 @@ class YoutubeExtractor(BaseExtractor):
 
     def extract(self, url: str) -> ExtractResult:
         try:
-            proc = subprocess.run(
-                ["yt-dlp", "--dump-json", "--no-download", url],
-                capture_output=True, text=True, timeout=60,
-            )
-        except FileNotFoundError:
-            raise ValueError("YouTube: 需要安装 yt-dlp (brew install yt-dlp)")
+            data = _ytdlp_info(url)
+        except Exception as e:
+            raise ValueError(f"YouTube: yt-dlp 错误: {str(e).strip()[:200]}")
+        if data is None:
+            # yt_dlp package not importable: fall back to the CLI
+            try:
+                proc = subprocess.run(
+                    ["yt-dlp", "--dump-json", "--no-download", url],
+                    capture_output=True, text=True, timeout=60,
+                )
+            except FileNotFoundError:
+                raise ValueError("YouTube: 需要安装 yt-dlp (brew install yt-dlp)")
 
-        if proc.returncode != 0:
-            raise ValueError(f"YouTube: yt-dlp 错误: {proc.stderr.strip()[:200]}")
+            if proc.returncode != 0:
+                raise ValueError(f"YouTube: yt-dlp 错误: {proc.stderr.strip()[:200]}")
 
-        data = json.loads(proc.stdout)
+            data = _json_loads(proc.stdout)
 
         media = []
         v_url = data.get("url", "")
@@ -2178,6 +2379,38 @@ class TwitterExtractor(BaseExtractor):
     # Twitter bearer token (public, used by web client)
     _BEARER = "AAAAAAAAAAAAAAAAAAAAANRILgAAAAAAnNwIzUejRCOuH5E6I8xnZz4puTs%3D1Zv7ttfk8LF81IUq16cHjhLTvJu4FA33AGWWjCpTnA"
 
+    # Guest tokens stay valid for hours; share one per process and refresh on 401/403.
+    _GUEST_TOKEN: Optional[str] = None
+    _GUEST_TOKEN_TS: float = 0.0
+    _GUEST_TOKEN_TTL = 1800
+    _GUEST_TOKEN_LOCK = threading.Lock()
+
+    # GraphQL query string is static except for tweetId; quote it once at class load.
+    _GRAPHQL_ENDPOINT = "https://twitter.com/i/api/graphql/0hWvDhmW8YQ-S_ib3azIrw/TweetResultByRestId"
+    _GRAPHQL_VARIABLES_Q = quote(json.dumps({
+        "tweetId": "__TID__", "withCommunity": False, "includePromotedContent": False, "withVoice": False,
+    }))
+    _GRAPHQL_FEATURES_Q = quote(json.dumps({
+        "creator_subscriptions_tweet_preview_api_enabled": True,
+        "tweetypie_unmention_optimization_enabled": True,
+        "responsive_web_edit_tweet_api_enabled": True,
+        "graphql_is_translatable_rweb_tweet_is_translatable_enabled": True,
+        "view_counts_everywhere_api_enabled": True,
+        "longform_notetweets_consumption_enabled": True,
+        "responsive_web_twitter_article_tweet_consumption_enabled": False,
+        "tweet_awards_web_tipping_enabled": False,
+        "freedom_of_speech_not_reach_fetch_enabled": True,
+        "standardized_nudges_misinfo": True,
+        "longform_notetweets_rich_text_read_enabled": True,
+        "longform_notetweets_inline_media_enabled": True,
+        "responsive_web_graphql_exclude_directive_enabled": True,
+        "verified_phone_label_enabled": False,
+        "responsive_web_media_download_video_enabled": False,
+        "responsive_web_graphql_skip_user_profile_image_extensions_enabled": False,
+        "responsive_web_graphql_timeline_navigation_enabled": True,
+        "responsive_web_enhance_cards_enabled": False,
+    }))
+
     def _extract_tweet_id(self, url: str) -> str:
         """Extract tweet ID from URL."""
         m = re.search(r'/status/(\d+)', url)
@@ -2368,6 +2601,27 @@ class TwitterExtractor(BaseExtractor):
             logger.warning(f"Syndication API 失败: {e}")
             return None
 
+    def _get_guest_token(self, client: httpx.Client, stale: str = "") -> str:
+        """Return a cached guest token, activating a new one when missing/expired.
+
+        Passing the rejected token as ``stale`` forces a refresh unless another
+        thread already replaced it.
+        """
+        cls = type(self)
+        with cls._GUEST_TOKEN_LOCK:
+            token = cls._GUEST_TOKEN
+            if token and token != stale and time.time() - cls._GUEST_TOKEN_TS < cls._GUEST_TOKEN_TTL:
+                return token
+            cls._GUEST_TOKEN = None
+            resp = client.post("https://api.twitter.com/1.1/guest/activate.json")
+            if resp.status_code != 200:
+                return ""
+            token = resp.json().get("guest_token", "")
+            if token:
+                cls._GUEST_TOKEN = token
+                cls._GUEST_TOKEN_TS = time.time()
+            return token
+
     def _try_guest_graphql(self, tweet_id: str) -> Optional[ExtractResult]:
         """Fallback: Guest token + GraphQL API - full data but may be rate limited."""
         try:
@@ -2375,43 +2629,23 @@ class TwitterExtractor(BaseExtractor):
                 "User-Agent": DESKTOP_UA,
                 "Authorization": f"Bearer {self._BEARER}",
             })
-            # Get guest token
-            resp = client.post("https://api.twitter.com/1.1/guest/activate.json")
-            if resp.status_code != 200:
-                _release_client(client)
-                return None
-            guest_token = resp.json().get("guest_token", "")
+            guest_token = self._get_guest_token(client)
             if not guest_token:
                 _release_client(client)
                 return None
 
             client.headers["x-guest-token"] = guest_token
 
-            # GraphQL query
-            variables = json.dumps({"tweetId": tweet_id, "withCommunity": False, "includePromotedContent": False, "withVoice": False})
-            features = json.dumps({
-                "creator_subscriptions_tweet_preview_api_enabled": True,
-                "tweetypie_unmention_optimization_enabled": True,
-                "responsive_web_edit_tweet_api_enabled": True,
-                "graphql_is_translatable_rweb_tweet_is_translatable_enabled": True,
-                "view_counts_everywhere_api_enabled": True,
-                "longform_notetweets_consumption_enabled": True,
-                "responsive_web_twitter_article_tweet_consumption_enabled": False,
-                "tweet_awards_web_tipping_enabled": False,
-                "freedom_of_speech_not_reach_fetch_enabled": True,
-                "standardized_nudges_misinfo": True,
-                "longform_notetweets_rich_text_read_enabled": True,
-                "longform_notetweets_inline_media_enabled": True,
-                "responsive_web_graphql_exclude_directive_enabled": True,
-                "verified_phone_label_enabled": False,
-                "responsive_web_media_download_video_enabled": False,
-                "responsive_web_graphql_skip_user_profile_image_extensions_enabled": False,
-                "responsive_web_graphql_timeline_navigation_enabled": True,
-                "responsive_web_enhance_cards_enabled": False,
-            })
-            from urllib.parse import quote
-            api_url = f"https://twitter.com/i/api/graphql/0hWvDhmW8YQ-S_ib3azIrw/TweetResultByRestId?variables={quote(variables)}&features={quote(features)}"
+            # GraphQL query (tweet_id is numeric, so plain substitution needs no re-quoting)
+            api_url = (f"{self._GRAPHQL_ENDPOINT}?variables={self._GRAPHQL_VARIABLES_Q.replace('__TID__', tweet_id)}"
+                       f"&features={self._GRAPHQL_FEATURES_Q}")
             resp = client.get(api_url)
+            if resp.status_code in (401, 403):
+                # Cached token was revoked: refresh once and retry
+                guest_token = self._get_guest_token(client, stale=guest_token)
+                if guest_token:
+                    client.headers["x-guest-token"] = guest_token
+                    resp = client.get(api_url)
             _release_client(client)
 
             if resp.status_code != 200:
@@ -2494,12 +2728,19 @@ class TwitterExtractor(BaseExtractor):
     def _try_ytdlp(self, url: str) -> Optional[ExtractResult]:
         """Last resort: yt-dlp for video tweets."""
         try:
-            proc = subprocess.run(
-                ["yt-dlp", "--dump-json", "--no-download", url],
-                capture_output=True, text=True, timeout=60,
-            )
-            if proc.returncode == 0:
-                data = json.loads(proc.stdout)
+            data = _ytdlp_info(url)
+        except Exception as e:
+            logger.warning(f"yt-dlp Twitter 提取失败: {e}")
+            return None
+        try:
+            if data is None:
+                proc = subprocess.run(
+                    ["yt-dlp", "--dump-json", "--no-download", url],
+                    capture_output=True, text=True, timeout=60,
+                )
+                if proc.returncode == 0:
+                    data = _json_loads(proc.stdout)
+            if data:
                 media = []
                 v_url = data.get("url", "")
                 if v_url:
@@ -2664,10 +2905,10 @@ class GooFishExtractor(BaseExtractor):
             results = []
 
             # Try __NEXT_DATA__ (Next.js SSR)
-            m = re.search(r'<script\s+id="__NEXT_DATA__"[^>]*>(.*?)</script>', page, re.DOTALL)
+            m = _RE_NEXT_DATA.search(page)
             if m:
                 try:
-                    next_data = json.loads(m.group(1))
+                    next_data = _json_loads(m.group(1))
                     props = next_data.get("props", {}).get("pageProps", {})
                     items = (props.get("searchResult", {}).get("data", {}).get("resultList", [])
                              or props.get("resultList", [])
@@ -2682,16 +2923,12 @@ class GooFishExtractor(BaseExtractor):
                     logger.warning(f"闲鱼 __NEXT_DATA__ 解析失败: {e}")
 
             # Try window.__INITIAL_STATE__ or window.__data__
-            for pattern in [
-                r'window\.__INITIAL_STATE__\s*=\s*(.*?);?\s*</script>',
-                r'window\.__data__\s*=\s*(.*?);?\s*</script>',
-                r'window\.rawData\s*=\s*(.*?);?\s*</script>',
-            ]:
-                m = re.search(pattern, page, re.DOTALL)
+            for pattern in (_RE_INITIAL_STATE, _RE_WINDOW_DATA, _RE_RAW_DATA):
+                m = pattern.search(page)
                 if m:
                     try:
                         raw = m.group(1).strip().replace("undefined", "null")
-                        state = json.loads(raw)
+                        state = _json_loads(raw)
                         # Navigate to result list
                         items = self._find_items_in_json(state)
                         for item in items[:count]:
@@ -2737,17 +2974,12 @@ class GooFishExtractor(BaseExtractor):
             results = []
 
             # Try embedded JSON
-            for pattern in [
-                r'<script\s+id="__NEXT_DATA__"[^>]*>(.*?)</script>',
-                r'window\.__INITIAL_STATE__\s*=\s*(.*?);?\s*</script>',
-                r'window\.rawData\s*=\s*(.*?);?\s*</script>',
-                r'"resultList"\s*:\s*(\[.*?\])\s*[,}]',
-            ]:
-                m = re.search(pattern, page, re.DOTALL)
+            for pattern in (_RE_NEXT_DATA, _RE_INITIAL_STATE, _RE_RAW_DATA, _RE_RESULT_LIST):
+                m = pattern.search(page)
                 if m:
                     try:
                         raw = m.group(1).strip().replace("undefined", "null")
-                        data = json.loads(raw)
+                        data = _json_loads(raw)
                         if isinstance(data, list):
                             items = data
                         elif isinstance(data, dict):
@@ -2905,27 +3137,24 @@ class GooFishExtractor(BaseExtractor):
         results = []
         # Try to find product cards via common patterns
         # Look for JSON-LD
-        for m in re.finditer(r'<script[^>]*type="application/ld\+json"[^>]*>(.*?)</script>', page, re.DOTALL):
+        for m in _RE_JSONLD.finditer(page):
+            blob = m.group(1)
+            # Most JSON-LD blocks are breadcrumbs/organization data; skip them unparsed
+            if '"Product"' not in blob:
+                continue
             try:
-                ld = json.loads(m.group(1))
-                if isinstance(ld, dict) and ld.get("@type") == "Product":
+                ld = _json_loads(blob)
+            except json.JSONDecodeError:
+                continue
+            for item in (ld if isinstance(ld, list) else (ld,)):
+                if isinstance(item, dict) and item.get("@type") == "Product":
+                    image = item.get("image")
                     results.append({
-                        "title": ld.get("name", ""),
-                        "price": str(ld.get("offers", {}).get("price", "")),
-                        "images": [ld.get("image", "")] if ld.get("image") else [],
+                        "title": item.get("name", ""),
+                        "price": str(_dig(item, "offers", "price")),
+                        "images": [image] if image else [],
                         "seller": "", "location": "", "item_id": "", "url": "", "want_count": 0,
                     })
-                elif isinstance(ld, list):
-                    for item in ld:
-                        if isinstance(item, dict) and item.get("@type") == "Product":
-                            results.append({
-                                "title": item.get("name", ""),
-                                "price": str(item.get("offers", {}).get("price", "")),
-                                "images": [item.get("image", "")] if item.get("image") else [],
-                                "seller": "", "location": "", "item_id": "", "url": "", "want_count": 0,
-                            })
-            except json.JSONDecodeError:
-                continue
         return results
 
     def extract(self, url: str) -> ExtractResult:
@@ -2940,10 +3169,10 @@ class GooFishExtractor(BaseExtractor):
             page = resp.text
 
             # Try __NEXT_DATA__
-            m = re.search(r'<script\s+id="__NEXT_DATA__"[^>]*>(.*?)</script>', page, re.DOTALL)
+            m = _RE_NEXT_DATA.search(page)
             if m:
                 try:
-                    next_data = json.loads(m.group(1))
+                    next_data = _json_loads(m.group(1))
                     props = next_data.get("props", {}).get("pageProps", {})
                     item = props.get("itemInfo", {}) or props.get("data", {}).get("itemInfo", {}) or props
                     return self._item_to_result(item, url)
@@ -2951,15 +3180,12 @@ class GooFishExtractor(BaseExtractor):
                     logger.warning(f"闲鱼商品 __NEXT_DATA__ 解析失败: {e}")
 
             # Try window.__INITIAL_STATE__
-            for pattern in [
-                r'window\.__INITIAL_STATE__\s*=\s*(.*?);?\s*</script>',
-                r'window\.__data__\s*=\s*(.*?);?\s*</script>',
-            ]:
-                m = re.search(pattern, page, re.DOTALL)
+            for pattern in (_RE_INITIAL_STATE, _RE_WINDOW_DATA):
+                m = pattern.search(page)
                 if m:
                     try:
                         raw = m.group(1).strip().replace("undefined", "null")
-                        state = json.loads(raw)
+                        state = _json_loads(raw)
                         item = state.get("itemInfo", {}) or state
                         return self._item_to_result(item, url)
                     except (json.JSONDecodeError, KeyError) as e:
@@ -2967,15 +3193,15 @@ class GooFishExtractor(BaseExtractor):
 
             # Meta tags fallback
             title = ""
-            m_title = re.search(r'<meta[^>]*property="og:title"[^>]*content="([^"]*)"', page)
+            m_title = _RE_OG_TITLE.search(page)
             if m_title:
-                title = html.unescape(m_title.group(1))
+                title = _unescape(m_title.group(1))
             desc = ""
-            m_desc = re.search(r'<meta[^>]*(?:property="og:description"|name="description")[^>]*content="([^"]*)"', page)
+            m_desc = _RE_OG_DESC.search(page)
             if m_desc:
-                desc = html.unescape(m_desc.group(1))
+                desc = _unescape(m_desc.group(1))
             cover = ""
-            m_img = re.search(r'<meta[^>]*property="og:image"[^>]*content="([^"]*)"', page)
+            m_img = _RE_OG_IMAGE.search(page)
             if m_img:
                 cover = m_img.group(1)
 
@@ -3026,17 +3252,39 @@ class GooFishExtractor(BaseExtractor):
 
 # ─── 提取入口 ──────────────────────────────────────────────────────────────────
 
-EXTRACTORS: dict[str, BaseExtractor] = {
-    "douyin": DouyinExtractor(),
-    "xiaohongshu": XiaohongshuExtractor(),
-    "bilibili": BilibiliExtractor(),
-    "weibo": WeiboExtractor(),
-    "kuaishou": KuaishouExtractor(),
-    "zhihu": ZhihuExtractor(),
-    "youtube": YoutubeExtractor(),
-    "twitter": TwitterExtractor(),
+_EXTRACTOR_CLASSES: dict[str, type[BaseExtractor]] = {
+    "douyin": DouyinExtractor,
+    "xiaohongshu": XiaohongshuExtractor,
+    "bilibili": BilibiliExtractor,
+    "weibo": WeiboExtractor,
+    "kuaishou": KuaishouExtractor,
+    "zhihu": ZhihuExtractor,
+    "youtube": YoutubeExtractor,
+    "twitter": TwitterExtractor,
 }
 
+
+@functools.lru_cache(maxsize=None)
+def get_extractor(platform: str) -> BaseExtractor:
+    """按需构造并复用平台提取器（单条 URL 只初始化一个）"""
+    return _EXTRACTOR_CLASSES[platform]()
+
+
+class _ExtractorMap(Mapping):
+    """只读的 EXTRACTORS 兼容映射：按平台取值时才经 get_extractor 构造"""
+
+    def __getitem__(self, platform: str) -> BaseExtractor:
+        return get_extractor(platform)
+
+    def __iter__(self):
+        return iter(_EXTRACTOR_CLASSES)
+
+    def __len__(self) -> int:
+        return len(_EXTRACTOR_CLASSES)
+
+
+EXTRACTORS: Mapping[str, BaseExtractor] = _ExtractorMap()
+
 PLATFORM_NAMES = {
     "douyin": "抖音",
     "xiaohongshu": "小红书",
@@ -3053,22 +3301,19 @@ def extract(url: str, comments: bool = False, comment_count: int = 20,
     """统一提取入口"""
     if not isinstance(url, str) or not url.strip():
         raise ValueError("url 不能为空")
-    urls = re.findall(r'https?://[^\s<>"\']+', url)
+    urls = _RE_URL_SNIFF.findall(url)
     if urls:
         url = urls[0]
     platform = detect_platform(url)
-    extractor = EXTRACTORS[platform]
+    extractor = get_extractor(platform)
     result = extractor.extract(url)
 
     if comments and not result.comments and result.raw_id:
         max_pages = max(1, (comment_count + 19) // 20)
-        if hasattr(extractor.fetch_comments, '__code__') and 'max_pages' in extractor.fetch_comments.__code__.co_varnames:
-            result.comments = extractor.fetch_comments(result.raw_id, count=comment_count, max_pages=max_pages)
-        else:
-            result.comments = extractor.fetch_comments(result.raw_id, count=comment_count)
+        result.comments = extractor.fetch_comments(result.raw_id, count=comment_count, max_pages=max_pages)
 
     if related and platform == "douyin" and result.raw_id:
-        result.related = EXTRACTORS["douyin"].fetch_related(result.raw_id)
+        result.related = get_extractor("douyin").fetch_related(result.raw_id)
 
     if analyze:
         try:
@@ -3089,51 +3334,64 @@ def extract(url: str, comments: bool = False, comment_count: int = 20,
 # ─── 批量处理 ──────────────────────────────────────────────────────────────────
 
 def batch_extract(links_file: str, as_json: bool = False, output_dir: str = None,
-                  fmt: str = "default") -> list[ExtractResult]:
+                  fmt: str = "default", concurrency: int = 8) -> list[ExtractResult]:
+    """Extract all links in a file. Requests run on a thread pool; output keeps file order."""
     results = []
     errors = []
-    with open(links_file) as f:
-        urls = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    with open(links_file, encoding="utf-8", errors="replace") as f:
+        lines = f.read().splitlines()
+    urls = [s for s in map(str.strip, lines) if s and s[0] != "#"]
 
     total = len(urls)
     if output_dir:
         os.makedirs(output_dir, exist_ok=True)
 
-    all_dicts = []
-    for i, url in enumerate(urls, 1):
-        print(f"[{i}/{total}] 处理中... {url[:60]}", file=sys.stderr)
-        try:
-            result = extract(url)
-            results.append(result)
-            if output_dir:
-                fname = f"{result.platform}_{result.raw_id or i}.json"
-                with open(os.path.join(output_dir, fname), "w") as f:
-                    json.dump(result.to_dict(), f, ensure_ascii=False, indent=2)
-            if as_json:
-                all_dicts.append(result.to_dict())
-            elif fmt == "markdown":
-                print(format_markdown(result))
-            elif fmt == "brief":
-                print(format_brief(result))
-            else:
-                print(format_result(result))
-        except HANDLED_EXCEPTIONS as e:
-            errors.append((url, str(e)))
-            print(f"  ❌ 错误: {e}", file=sys.stderr)
-            logger.warning(f"批量提取失败 [{url}]: {e}")
+    progress_lock = threading.Lock()
+
+    def _run(i: int, url: str) -> ExtractResult:
+        with progress_lock:
+            sys.stderr.write(f"[{i}/{total}] 处理中... {url[:60]}\n")
+        return extract(url)
+
+    # Each result is serialized once and the bytes feed both the per-file
+    # output and the aggregate array.
+    json_chunks: list[bytes] = []
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = [(i, url, pool.submit(_run, i, url)) for i, url in enumerate(urls, 1)]
+        for i, url, future in futures:
+            try:
+                result = future.result()
+                results.append(result)
+                payload = _json_dumpb(result.to_dict()) if (as_json or output_dir) else b""
+                if output_dir:
+                    fname = f"{result.platform}_{result.raw_id or i}.json"
+                    with open(os.path.join(output_dir, fname), "wb") as f:
+                        f.write(payload)
+                if as_json:
+                    json_chunks.append(payload)
+                elif fmt == "markdown":
+                    print(format_markdown(result))
+                elif fmt == "brief":
+                    print(format_brief(result))
+                else:
+                    print(format_result(result))
+            except HANDLED_EXCEPTIONS as e:
+                errors.append((url, str(e)))
+                with progress_lock:
+                    sys.stderr.write(f"  ❌ 错误: {e}\n")
+                logger.warning(f"批量提取失败 [{url}]: {e}")
 
     # JSON batch output as array
-    if as_json and all_dicts:
-        print(json.dumps(all_dicts, ensure_ascii=False, indent=2))
+    if as_json and json_chunks:
+        print((b"[\n" + b",\n".join(json_chunks) + b"\n]").decode())
 
     # Summary
-    print(f"\n{'═'*40}", file=sys.stderr)
-    print(f"  批量处理完成: 成功 {len(results)}/{total}", file=sys.stderr)
+    summary = [f"\n{'═'*40}", f"  批量处理完成: 成功 {len(results)}/{total}"]
     if errors:
-        print(f"  失败 {len(errors)} 个:", file=sys.stderr)
-        for url, err in errors:
-            print(f"    - {url[:50]}: {err[:50]}", file=sys.stderr)
-    print(f"{'═'*40}", file=sys.stderr)
+        summary.append(f"  失败 {len(errors)} 个:")
+        summary.extend(f"    - {url[:50]}: {err[:50]}" for url, err in errors)
+    summary.append(f"{'═'*40}\n")
+    sys.stderr.write("\n".join(summary))
 
     return results
 
@@ -3144,16 +3402,24 @@ def download_media(result: ExtractResult, output_dir: str = ".") -> list[str]:
         os.makedirs(output_dir, exist_ok=True)
         try:
             out_tmpl = os.path.join(output_dir, f"{result.platform}_{result.raw_id}.%(ext)s")
+            files = _ytdlp_download(result.url, out_tmpl)
+            if files is not None:
+                for f in files:
+                    print(f"  ✓ {os.path.basename(f)} ({os.path.getsize(f)/1024/1024:.1f} MB)")
+                return files
+            # yt_dlp package not importable: fall back to the CLI
             proc = subprocess.run(
                 ["yt-dlp", "-o", out_tmpl, result.url],
                 capture_output=True, text=True, timeout=300,
             )
             if proc.returncode == 0:
-                import glob
-                pattern = os.path.join(output_dir, f"{result.platform}_{result.raw_id}.*")
-                files = glob.glob(pattern)
-                for f in files:
-                    print(f"  ✓ {os.path.basename(f)} ({os.path.getsize(f)/1024/1024:.1f} MB)")
+                prefix = f"{result.platform}_{result.raw_id}."
+                files = []
+                with os.scandir(output_dir) as it:
+                    for entry in it:
+                        if entry.name.startswith(prefix) and entry.is_file():
+                            print(f"  ✓ {entry.name} ({entry.stat().st_size/1024/1024:.1f} MB)")
+                            files.append(entry.path)
                 return files
         except HANDLED_EXCEPTIONS as e:
             print(f"  yt-dlp 下载失败: {e}", file=sys.stderr)
@@ -3165,29 +3431,87 @@ def download_media(result: ExtractResult, output_dir: str = ".") -> list[str]:
     if result.platform == "bilibili":
         client.headers["Referer"] = "https://www.bilibili.com/"
 
+    jobs = []
     for i, m in enumerate(result.media):
         if not m.url:
             continue
         ext = "mp4" if m.type == "video" else "jpg"
         fname = f"{result.platform}_{result.raw_id}_{i}.{ext}"
-        fpath = os.path.join(output_dir, fname)
+        jobs.append((m.url, fname, os.path.join(output_dir, fname)))
 
-        print(f"  下载: {fname} ...", end=" ", flush=True)
-        try:
-            resp = client.get(m.url, timeout=60)
-            resp.raise_for_status()
-            with open(fpath, "wb") as f:
-                f.write(resp.content)
-            size = os.path.getsize(fpath)
-            print(f"✓ ({size/1024/1024:.1f} MB)")
-            downloaded.append(fpath)
-        except HANDLED_EXCEPTIONS as e:
-            print(f"✗ ({e})")
-            logger.warning(f"下载失败 platform={result.platform} url={m.url} file={fname}: {e}")
+    # Multi-image posts download concurrently; output is reported in media order.
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [(url, fname, fpath, pool.submit(_download_to_file, client, url, fpath))
+                   for url, fname, fpath in jobs]
+        for url, fname, fpath, future in futures:
+            try:
+                size = future.result()
+                print(f"  下载: {fname} ... ✓ ({size/1024/1024:.1f} MB)")
+                downloaded.append(fpath)
+            except HANDLED_EXCEPTIONS as e:
+                print(f"  下载: {fname} ... ✗ ({e})")
+                logger.warning(f"下载失败 platform={result.platform} url={url} file={fname}: {e}")
 
     _release_client(client)
     return downloaded
 
+
+_ytdlp_local = threading.local()
+
+def _ytdlp_info(url: str) -> Optional[dict]:
+    """Metadata via the in-process yt_dlp API, same shape as ``yt-dlp --dump-json``.
+
+    Returns None when the yt_dlp package is unavailable; yt_dlp errors propagate.
+    YoutubeDL is not thread-safe, so each worker thread keeps one long-lived instance.
+    """
+    try:
+        import yt_dlp
+    except ImportError:
+        return None
+    cached = getattr(_ytdlp_local, "ydl", None)
+    if cached is None or cached[0] is not yt_dlp:
+        opts = {"quiet": True, "no_warnings": True, "noprogress": True, "skip_download": True}
+        cached = _ytdlp_local.ydl = (yt_dlp, yt_dlp.YoutubeDL(opts))
+    ydl = cached[1]
+    info = ydl.extract_info(url, download=False) or {}
+    return ydl.sanitize_info(info)
+
+def _ytdlp_download(url: str, out_tmpl: str) -> Optional[list[str]]:
+    """Download via the in-process yt_dlp API, avoiding a CLI subprocess.
+
+    Returns the written file paths, or None when the yt_dlp package is unavailable.
+    """
+    try:
+        import yt_dlp
+    except ImportError:
+        return None
+    opts = {"outtmpl": out_tmpl, "quiet": True, "no_warnings": True, "noprogress": True}
+    try:
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            info = ydl.extract_info(url, download=True) or {}
+    except yt_dlp.utils.DownloadError as e:
+        print(f"  yt-dlp 下载失败: {e}", file=sys.stderr)
+        return []
+    return [d["filepath"] for d in info.get("requested_downloads", []) if d.get("filepath")]
+
+
+def _download_to_file(client: httpx.Client, url: str, fpath: str) -> int:
+    """Stream a response body to disk in chunks and return the byte count."""
+    size = 0
+    try:
+        with client.stream("GET", url, timeout=60) as resp:
+            resp.raise_for_status()
+            with open(fpath, "wb") as f:
+                for chunk in resp.iter_bytes(chunk_size=64 * 1024):
+                    f.write(chunk)
+                    size += len(chunk)
+    except HANDLED_EXCEPTIONS:
+        # Don't leave a truncated file behind
+        if os.path.exists(fpath):
+            os.remove(fpath)
+        raise
+    return size
+
 # ─── 格式化输出 ─────────────────────────────────────────────────────────────────
 
 def format_result(r: ExtractResult) -> str:
@@ -3200,7 +3524,7 @@ def format_result(r: ExtractResult) -> str:
     lines.append(f"{'─'*60}")
     lines.append(f"  标题: {r.title}")
     if r.description and r.description != r.title:
-        desc = r.description[:200] + ("..." if len(r.description) > 200 else "")
+        desc = _trunc(r.description, 200)
         lines.append(f"  描述: {desc}")
     author_info = f"  作者: {r.author.nickname} (uid: {r.author.uid})"
     if r.author.followers:
@@ -3242,11 +3566,11 @@ def format_result(r: ExtractResult) -> str:
     lines.append(f"{'─'*60}")
     for i, m in enumerate(r.media):
         label = "🎬 视频" if m.type == "video" else "🖼  图片"
-        url_display = m.url[:100] + ("..." if len(m.url) > 100 else "")
+        url_display = _trunc(m.url, 100)
         lines.append(f"  {label} [{i}]: {url_display}")
 
     if r.cover_url:
-        lines.append(f"  🖼  封面: {r.cover_url[:100]}...")
+        lines.append(f"  🖼  封面: {_trunc(r.cover_url, 100)}")
 
     if r.pages:
         lines.append(f"{'─'*60}")
@@ -3375,6 +3699,8 @@ def format_brief(r: ExtractResult) -> str:
 # ─── CLI ───────────────────────────────────────────────────────────────────────
 
 def main():
+    import argparse  # CLI only; keeps it off the library import path
+
     parser = argparse.ArgumentParser(
         description="ClawKit v3.3 - 社交媒体内容提取工具",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -3396,6 +3722,7 @@ def main():
     parser.add_argument("--comments", "-c", action="store_true", help="同时抓取评论")
     parser.add_argument("--comment-count", type=int, default=20, help="评论数量 (默认20, 最多100)")
     parser.add_argument("--batch", "-b", metavar="FILE", help="批量处理: 从文件读取链接列表")
+    parser.add_argument("--concurrency", type=int, default=8, help="批量处理并发数 (默认8)")
     parser.add_argument("--verbose", "-v", action="store_true", help="详细日志")
     parser.add_argument("--user", action="store_true", help="提取用户主页信息 (抖音/Twitter/B站)")
     parser.add_argument("--search", metavar="KEYWORD", help="搜索关键词 (抖音)")
@@ -3415,10 +3742,10 @@ def main():
     # Trending mode
     if args.trending:
         try:
-            extractor = EXTRACTORS[args.trending]
+            extractor = get_extractor(args.trending)
             results = _cached_trending(args.trending, extractor.trending)
             if args.json:
-                print(json.dumps(results, ensure_ascii=False, indent=2))
+                print(_json_dumps(results))
             else:
                 platform_name = PLATFORM_NAMES.get(args.trending, args.trending)
                 print(f"\n🔥 {platform_name} 热门榜单\n{'─' * 50}")
@@ -3438,18 +3765,18 @@ def main():
     if args.user and args.url:
         url_lower = args.url.lower()
         if any(k in url_lower for k in ["twitter.com", "x.com", "@"]):
-            result = EXTRACTORS["twitter"].extract_user(args.url)
+            result = get_extractor("twitter").extract_user(args.url)
         elif any(k in url_lower for k in ["bilibili.com", "b23.tv"]) or args.url.isdigit():
-            result = EXTRACTORS["bilibili"].extract_user(args.url)
+            result = get_extractor("bilibili").extract_user(args.url)
         else:
-            result = EXTRACTORS["douyin"].extract_user(args.url)
-        print(json.dumps(result, ensure_ascii=False, indent=2))
+            result = get_extractor("douyin").extract_user(args.url)
+        print(_json_dumps(result))
         return
 
     # Search mode (douyin)
     if args.search:
-        result = EXTRACTORS["douyin"].search(args.search)
-        print(json.dumps(result, ensure_ascii=False, indent=2))
+        result = get_extractor("douyin").search(args.search)
+        print(_json_dumps(result))
         return
 
     fmt = "markdown" if args.markdown else ("brief" if args.brief else "default")
@@ -3457,7 +3784,7 @@ def main():
     if args.batch:
         batch_extract(args.batch, as_json=args.json,
                       output_dir=args.output if args.output != "./downloads" else None,
-                      fmt=fmt)
+                      fmt=fmt, concurrency=args.concurrency)
         return
 
     if not args.url:
@@ -3471,7 +3798,7 @@ def main():
                         analyze=args.analyze)
 
         if args.json:
-            print(json.dumps(result.to_dict(), ensure_ascii=False, indent=2))
+            print(_json_dumps(result.to_dict()))
         elif args.markdown:
             print(format_markdown(result))
         elif args.brief:
@@ -1,6 +1,51 @@
+import hashlib
 import json
 import os
-import re
+import shelve
+import threading
+from pathlib import Path
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Analyses are cached by content hash so repeated posts skip the LLM round-trip.
+CACHE_PATH = Path(os.getenv("CLAWKIT_CACHE_DIR") or Path.home() / ".cache" / "clawkit") / "analysis.db"
+_MEMORY_CACHE_SIZE = 512
+_memory_cache: dict[str, dict] = {}
+_cache_lock = threading.Lock()
+
+# Shorter texts carry too little signal to be worth a model call.
+_MIN_ANALYZE_CHARS = 30
+
+_PROMPT_INSTRUCTIONS = """你是社交媒体内容分析助手。请基于下面的内容做“价值解读”，不是简单压缩。
+
+要求：
+1) 判断内容类型（教程/观点/带货/资讯/故事等，可组合）。
+2) 提炼关键观点 key_points（强调真正有用的信息，不是机械摘要）。
+3) 输出 value_insight：指出哪些内容有真实价值、哪些是包装，为什么有用或不够有用。
+4) 输出 applicable_to：这类内容适合谁看。
+5) 输出 credibility：评估可信度并说明依据（如是否有数据、案例、可验证方法）。
+6) 输出 summary：一句话总结。
+
+"""
+
+_PROMPT_SCHEMA = """
+
+只输出 JSON，对象结构必须为：
+{
+  "content_type": "",
+  "key_points": [""],
+  "value_insight": "",
+  "applicable_to": "",
+  "credibility": "",
+  "summary": ""
+}
+
+内容全文见下一段。
+"""
 
 
 def _get_api_key() -> str:
@@ -18,67 +63,117 @@ def _default_result() -> dict:
     }
 
 
+def _find_json_object(s: str, start: int = 0) -> tuple[int, int] | None:
+    """Return (start, end) of the first balanced {...} at or after `start`, string-aware."""
+    begin = s.find("{", start)
+    if begin < 0:
+        return None
+    depth = 0
+    in_str = False
+    escaped = False
+    for i in range(begin, len(s)):
+        ch = s[i]
+        if in_str:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_str = False
+        elif ch == '"':
+            in_str = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return begin, i + 1
+    return None
+
+
 def _extract_json(text: str) -> dict:
     text = (text or "").strip()
     if not text:
         return {}
     try:
-        return json.loads(text)
+        return _json_loads(text)
     except Exception:
-        m = re.search(r"\{[\s\S]*\}", text)
-        if not m:
-            return {}
+        pos = 0
+        while (span := _find_json_object(text, pos)) is not None:
+            try:
+                return _json_loads(text[span[0]:span[1]])
+            except Exception:
+                pos = span[0] + 1
+        return {}
+
+
+def _cache_key(full_text: str, platform: str, stats: dict) -> str:
+    digest = hashlib.blake2b(full_text.encode("utf-8"), digest_size=16).hexdigest()
+    return f"{digest}:{platform}:{json.dumps(stats or {}, sort_keys=True, ensure_ascii=False)}"
+
+
+def _copy_result(out: dict) -> dict:
+    return {**out, "key_points": list(out.get("key_points") or [])}
+
+
+def _cache_get(key: str) -> dict | None:
+    with _cache_lock:
+        hit = _memory_cache.get(key)
+        if hit is None:
+            try:
+                CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+                with shelve.open(str(CACHE_PATH)) as db:
+                    hit = db.get(key)
+            except Exception:
+                return None
+            if hit is None:
+                return None
+            _memory_cache[key] = hit
+        return _copy_result(hit)
+
+
+def _cache_put(key: str, out: dict) -> None:
+    with _cache_lock:
+        if len(_memory_cache) >= _MEMORY_CACHE_SIZE:
+            _memory_cache.pop(next(iter(_memory_cache)))
+        _memory_cache[key] = _copy_result(out)
         try:
-            return json.loads(m.group(0))
+            CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with shelve.open(str(CACHE_PATH)) as db:
+                db[key] = _memory_cache[key]
         except Exception:
-            return {}
+            pass
 
 
 def analyze_content(full_text: str, platform: str, stats: dict) -> dict:
     base = _default_result()
-    if not full_text or not full_text.strip():
+    if not full_text or len(full_text.strip()) < _MIN_ANALYZE_CHARS:
         return base
 
     api_key = _get_api_key()
     if not api_key:
         return base
 
+    cache_key = _cache_key(full_text, platform, stats)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
         from google import genai
     except Exception:
         return base
 
-    prompt = f"""
-你是社交媒体内容分析助手。请基于下面的内容做“价值解读”，不是简单压缩。
-
-要求：
-1) 判断内容类型（教程/观点/带货/资讯/故事等，可组合）。
-2) 提炼关键观点 key_points（强调真正有用的信息，不是机械摘要）。
-3) 输出 value_insight：指出哪些内容有真实价值、哪些是包装，为什么有用或不够有用。
-4) 输出 applicable_to：这类内容适合谁看。
-5) 输出 credibility：评估可信度并说明依据（如是否有数据、案例、可验证方法）。
-6) 输出 summary：一句话总结。
-
-平台: {platform}
-互动数据: {json.dumps(stats or {}, ensure_ascii=False)}
-
-内容全文:
-{full_text}
-
-只输出 JSON，对象结构必须为：
-{{
-  "content_type": "",
-  "key_points": [""],
-  "value_insight": "",
-  "applicable_to": "",
-  "credibility": "",
-  "summary": ""
-}}
-""".strip()
+    prompt_header = "".join((
+        _PROMPT_INSTRUCTIONS,
+        "平台: ", platform,
+        "\n互动数据: ", json.dumps(stats or {}, ensure_ascii=False),
+        _PROMPT_SCHEMA,
+    ))
 
     try:
         client = genai.Client(api_key=api_key)
-        resp = client.models.generate_content(model="gemini-2.0-flash", contents=prompt)
+        resp = client.models.generate_content(model="gemini-2.0-flash", contents=[prompt_header, full_text])
         parsed = _extract_json(getattr(resp, "text", "") or "")
         if not isinstance(parsed, dict):
             return base
@@ -86,6 +181,8 @@ def analyze_content(full_text: str, platform: str, stats: dict) -> dict:
         out = {**base, **parsed}
         if not isinstance(out.get("key_points"), list):
             out["key_points"] = []
+        if parsed:
+            _cache_put(cache_key, out)
         return out
     except Exception:
         return base
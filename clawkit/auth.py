@@ -26,11 +26,31 @@ import sys
 import time
 import os
 import fcntl
+import functools
+import tempfile
 from datetime import datetime, timedelta
 from pathlib import Path
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads  # orjson.JSONDecodeError subclasses json.JSONDecodeError
+
+    def _json_dumpb(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumpb(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode()
+
 # Platform login configurations
 LOGIN_TIMEOUT = float(os.getenv("CLAWKIT_LOGIN_TIMEOUT", "300"))
+# Login completion is detected from browser events; this is only a safety-net
+# re-check for cookies set by page scripts, which fire no Set-Cookie header.
+LOGIN_RECHECK_INTERVAL = 15.0
+# is_authenticated() results are reused for this long; _save() drops them early.
+AUTH_CACHE_TTL = 60.0
 
 PLATFORMS = {
     "weibo": {
@@ -67,6 +87,45 @@ PLATFORMS = {
         "expires_days": 30,
     },
 }
+# Success cookie names per platform as sets, for isdisjoint() checks.
+_SUCCESS_COOKIES = {pid: frozenset(cfg["success_cookies"]) for pid, cfg in PLATFORMS.items()}
+
+BROWSER_CONTEXT_OPTIONS = {
+    "user_agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+                  "AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/131.0.0.0 Safari/537.36",
+    "viewport": {"width": 1280, "height": 800},
+    "locale": "zh-CN",
+}
+
+
+def _raw_cookie(c: dict) -> dict:
+    """Playwright cookie -> stored raw_cookies entry with explicit defaults."""
+    get = c.get
+    return {
+        "name": c["name"],
+        "value": c["value"],
+        "domain": c["domain"],
+        "path": get("path", "/"),
+        "expires": get("expires", -1),
+        "httpOnly": get("httpOnly", False),
+        "secure": get("secure", False),
+        "sameSite": get("sameSite", "Lax"),
+    }
+
+
+def _cookie_header(cookies: dict) -> str:
+    # Memoized in memory only, keyed on the cookies themselves, so hand edits
+    # to cookies.json are picked up and nothing derived is written back.
+    try:
+        return _join_cookie_items(tuple(cookies.items()))
+    except TypeError:  # unhashable hand-edited values
+        return "; ".join(f"{k}={v}" for k, v in cookies.items())
+
+
+@functools.lru_cache(maxsize=64)
+def _join_cookie_items(items: tuple) -> str:
+    return "; ".join(f"{k}={v}" for k, v in items)
 
 
 class CookieManager:
@@ -75,95 +134,137 @@ class CookieManager:
 
     def __init__(self):
         self.COOKIE_DIR.mkdir(parents=True, exist_ok=True)
+        self._saved = b""
         self._data = self._load()
+        self._save_lock = asyncio.Lock()
+        self._auth_cache: dict[str, tuple[float, bool]] = {}
 
     def _load(self) -> dict:
+        # Writers swap the file in atomically, so readers never see a partial write
         if self.COOKIE_FILE.exists():
             try:
-                with open(self.COOKIE_FILE, "r", encoding="utf-8") as f:
-                    fcntl.flock(f.fileno(), fcntl.LOCK_SH)
-                    try:
-                        return json.loads(f.read() or "{}")
-                    finally:
-                        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                raw = self.COOKIE_FILE.read_bytes()
+                data = _json_loads(raw or b"{}")
             except (json.JSONDecodeError, OSError):
                 return {}
+            self._saved = raw
+            for entry in data.values() if isinstance(data, dict) else ():
+                if isinstance(entry, dict):
+                    # Dropped field: older builds persisted a derived header here
+                    entry.pop("cookie_header", None)
+            return data
         return {}
 
     def _save(self):
-        with open(self.COOKIE_FILE, "w", encoding="utf-8") as f:
-            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        self._auth_cache.clear()
+        raw = _json_dumpb(self._data)
+        if raw == self._saved:
+            return
+        # Serialize writers on a sidecar lock, write a temp file, then rename over
+        lock_path = self.COOKIE_FILE.with_suffix(".lock")
+        with open(lock_path, "a") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
             try:
-                f.write(json.dumps(self._data, ensure_ascii=False, indent=2))
+                fd, tmp_path = tempfile.mkstemp(dir=self.COOKIE_FILE.parent, prefix=".cookies.", suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        f.write(raw)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_path, self.COOKIE_FILE)
+                except BaseException:
+                    Path(tmp_path).unlink(missing_ok=True)
+                    raise
             finally:
-                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+        self._saved = raw
 
     # ── public API ──────────────────────────────────────────
 
     async def login(self, platform: str):
         """Launch browser for user to login, detect success, save cookies."""
-        cfg = PLATFORMS[platform]
+        results = await self.login_all([platform])
+        return results[platform]
+
+    async def login_all(self, platforms: list[str]) -> dict[str, bool]:
+        """Log into several platforms concurrently with one Chromium, one context per platform."""
         print(f"🌐 正在启动浏览器...")
-        print(f"📱 请在浏览器中登录{cfg['name']}（扫码或输入验证码）")
-        if cfg.get("note"):
-            print(f"💡 提示: {cfg['note']}")
 
         from playwright.async_api import async_playwright
 
         async with async_playwright() as p:
             browser = await p.chromium.launch(headless=False)
-            ctx = await browser.new_context(
-                user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                           "AppleWebKit/537.36 (KHTML, like Gecko) "
-                           "Chrome/131.0.0.0 Safari/537.36",
-                viewport={"width": 1280, "height": 800},
-                locale="zh-CN",
-            )
-            page = await ctx.new_page()
-            await page.goto(cfg["login_url"], wait_until="domcontentloaded")
-
-            print("⏳ 等待登录完成...")
-
-            # Poll for success cookies (max 5 min)
-            deadline = time.time() + LOGIN_TIMEOUT
-            success = False
-            while time.time() < deadline:
-                await asyncio.sleep(2)
-                cookies = await ctx.cookies()
-                cookie_names = {c["name"] for c in cookies}
-                # Check if ANY of the success cookies appeared
-                if any(sc in cookie_names for sc in cfg["success_cookies"]):
-                    success = True
-                    break
-
-            if not success:
-                print("❌ 登录超时（5分钟），请重试")
+            try:
+                contexts = await asyncio.gather(
+                    *(browser.new_context(**BROWSER_CONTEXT_OPTIONS) for _ in platforms)
+                )
+                try:
+                    # Logins mostly wait on the user, so running them side by side is nearly free
+                    outcomes = await asyncio.gather(
+                        *(self._login_in_context(ctx, t) for ctx, t in zip(contexts, platforms))
+                    )
+                finally:
+                    await asyncio.gather(*(ctx.close() for ctx in contexts))
+            finally:
                 await browser.close()
-                return False
-
-            # Gather all cookies for relevant domains
-            all_cookies = await ctx.cookies()
-            cookie_dict = {}
-            raw_cookies = []
-            for c in all_cookies:
-                cookie_dict[c["name"]] = c["value"]
-                raw_cookies.append({
-                    "name": c["name"],
-                    "value": c["value"],
-                    "domain": c["domain"],
-                    "path": c.get("path", "/"),
-                    "expires": c.get("expires", -1),
-                    "httpOnly": c.get("httpOnly", False),
-                    "secure": c.get("secure", False),
-                    "sameSite": c.get("sameSite", "Lax"),
-                })
-
-            ua = await page.evaluate("navigator.userAgent")
-            await browser.close()
-
-            now = datetime.now().isoformat(timespec="seconds")
-            expires = (datetime.now() + timedelta(days=cfg["expires_days"])).isoformat(timespec="seconds")
+        return dict(zip(platforms, outcomes))
 
+    async def _login_in_context(self, ctx, platform: str) -> bool:
+        """Drive one platform's login inside an existing browser context."""
+        cfg = PLATFORMS[platform]
+        print(f"📱 请在浏览器中登录{cfg['name']}（扫码或输入验证码）")
+        if cfg.get("note"):
+            print(f"💡 提示: {cfg['note']}")
+
+        page = await ctx.new_page()
+        wake = asyncio.Event()
+
+        def _on_navigated(frame):
+            if frame is page.main_frame and any(s in frame.url for s in cfg["success_url_contains"]):
+                wake.set()
+
+        async def _on_response(resp):
+            # Only document/XHR responses can carry the session cookies we wait for
+            if resp.request.resource_type not in ("document", "xhr", "fetch"):
+                return
+            set_cookie = await resp.header_value("set-cookie") or ""
+            if any(f"{sc}=" in set_cookie for sc in cfg["success_cookies"]):
+                wake.set()
+
+        page.on("framenavigated", _on_navigated)
+        ctx.on("response", _on_response)
+        await page.goto(cfg["login_url"], wait_until="domcontentloaded")
+
+        print("⏳ 等待登录完成...")
+
+        # Sleep until a success URL/Set-Cookie shows up, then confirm against
+        # the cookie jar; success URLs are loose and may match the login page.
+        deadline = time.time() + LOGIN_TIMEOUT
+        all_cookies = None
+        while (remaining := deadline - time.time()) > 0:
+            try:
+                await asyncio.wait_for(wake.wait(), timeout=min(remaining, LOGIN_RECHECK_INTERVAL))
+            except asyncio.TimeoutError:
+                pass
+            wake.clear()
+            cookies = await ctx.cookies()
+            if not _SUCCESS_COOKIES[platform].isdisjoint(c["name"] for c in cookies):
+                all_cookies = cookies
+                break
+
+        if all_cookies is None:
+            print("❌ 登录超时（5分钟），请重试")
+            return False
+
+        cookie_dict = {c["name"]: c["value"] for c in all_cookies}
+        raw_cookies = [_raw_cookie(c) for c in all_cookies]
+
+        ua = await page.evaluate("navigator.userAgent")
+
+        now = datetime.now().isoformat(timespec="seconds")
+        expires = (datetime.now() + timedelta(days=cfg["expires_days"])).isoformat(timespec="seconds")
+
+        async with self._save_lock:
             self._data[platform] = {
                 "cookies": cookie_dict,
                 "raw_cookies": raw_cookies,
@@ -173,8 +274,8 @@ class CookieManager:
             }
             self._save()
 
-            print(f"✅ {cfg['name']}登录成功！Cookie 已保存到 {self.COOKIE_FILE}")
-            return True
+        print(f"✅ {cfg['name']}登录成功！Cookie 已保存到 {self.COOKIE_FILE}")
+        return True
 
     def get_cookies(self, platform: str) -> dict | None:
         """Return simple {name: value} cookie dict, or None."""
@@ -197,6 +298,15 @@ class CookieManager:
         return None
 
     def is_authenticated(self, platform: str) -> bool:
+        now = time.time()
+        cached = self._auth_cache.get(platform)
+        if cached and now < cached[0]:
+            return cached[1]
+        authed = self._check_authenticated(platform)
+        self._auth_cache[platform] = (now + AUTH_CACHE_TTL, authed)
+        return authed
+
+    def _check_authenticated(self, platform: str) -> bool:
         entry = self._data.get(platform)
         if not entry:
             return False
@@ -207,17 +317,15 @@ class CookieManager:
                     return False
             except ValueError:
                 pass
-        cfg = PLATFORMS.get(platform, {})
         cookies = entry.get("cookies", {})
-        success_keys = cfg.get("success_cookies", [])
-        return any(k in cookies for k in success_keys)
+        return not _SUCCESS_COOKIES.get(platform, frozenset()).isdisjoint(cookies)
 
     def get_cookie_header(self, platform: str) -> str | None:
         """Return a Cookie header string ready for HTTP requests."""
         cookies = self.get_cookies(platform)
         if not cookies:
             return None
-        return "; ".join(f"{k}={v}" for k, v in cookies.items())
+        return _cookie_header(cookies)
 
     def status(self):
         """Print status table."""
@@ -254,9 +362,15 @@ class CookieManager:
             if not data:
                 print(f"❌ {platform} 未登录")
                 return
-            print(json.dumps({platform: data}, ensure_ascii=False, indent=2))
+            print(_json_dumpb({platform: data}).decode())
         else:
-            print(json.dumps(self._data, ensure_ascii=False, indent=2))
+            print(_json_dumpb(self._data).decode())
+
+
+@functools.lru_cache(maxsize=1)
+def get_manager() -> CookieManager:
+    """Process-wide CookieManager; the cookie file is read only on first use."""
+    return CookieManager()
 
 
 # ── CLI ─────────────────────────────────────────────────
@@ -267,7 +381,7 @@ def main():
         print(__doc__)
         return
 
-    cm = CookieManager()
+    cm = get_manager()
     cmd = args[0]
 
     if cmd == "status":
@@ -287,8 +401,7 @@ def main():
             print(f"❌ 未知平台: {target}")
             print(f"支持: {', '.join(PLATFORMS.keys())}")
             return
-        for t in targets:
-            asyncio.run(cm.login(t))
+        asyncio.run(cm.login_all(targets))
     else:
         print(f"❌ 未知命令: {cmd}")
         print("支持: login, status, export")
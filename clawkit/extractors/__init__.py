@@ -1,28 +1,48 @@
-from .douyin import DouyinExtractor
-from .xiaohongshu import XiaohongshuExtractor
-from .bilibili import BilibiliExtractor
-from .weibo import WeiboExtractor
-from .zhihu import ZhihuExtractor
-from .kuaishou import KuaishouExtractor
-from .youtube import YoutubeExtractor
-from .twitter import TwitterExtractor
-from .goofish import GooFishExtractor
-from .._legacy import detect_platform, extract as _extract
-
-EXTRACTORS = {
-    "douyin": DouyinExtractor,
-    "xiaohongshu": XiaohongshuExtractor,
-    "bilibili": BilibiliExtractor,
-    "weibo": WeiboExtractor,
-    "zhihu": ZhihuExtractor,
-    "kuaishou": KuaishouExtractor,
-    "youtube": YoutubeExtractor,
-    "twitter": TwitterExtractor,
-    "goofish": GooFishExtractor,
+import importlib
+
+# Resolved on first attribute access (PEP 562) so importing the package
+# does not pull in every platform module up front.
+_LAZY = {
+    "DouyinExtractor": ".douyin",
+    "XiaohongshuExtractor": ".xiaohongshu",
+    "BilibiliExtractor": ".bilibili",
+    "WeiboExtractor": ".weibo",
+    "ZhihuExtractor": ".zhihu",
+    "KuaishouExtractor": ".kuaishou",
+    "YoutubeExtractor": ".youtube",
+    "TwitterExtractor": ".twitter",
+    "GooFishExtractor": ".goofish",
+}
+
+_PLATFORMS = {
+    "douyin": "DouyinExtractor",
+    "xiaohongshu": "XiaohongshuExtractor",
+    "bilibili": "BilibiliExtractor",
+    "weibo": "WeiboExtractor",
+    "zhihu": "ZhihuExtractor",
+    "kuaishou": "KuaishouExtractor",
+    "youtube": "YoutubeExtractor",
+    "twitter": "TwitterExtractor",
+    "goofish": "GooFishExtractor",
 }
 
 
+def __getattr__(name: str):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    elif name == "EXTRACTORS":
+        value = {platform: __getattr__(cls) for platform, cls in _PLATFORMS.items()}
+    elif name == "detect_platform":
+        from .._legacy import detect_platform as value
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
 def extract(url: str, *args, analyze: bool = False, **kwargs):
+    from .._legacy import extract as _extract
+
     return _extract(url, *args, analyze=analyze, **kwargs)
 
 
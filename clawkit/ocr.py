@@ -1,17 +1,29 @@
+import functools
 import os
+import re
 import shutil
 import subprocess
-import tempfile
 import warnings
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 
 import httpx
 
+from .http import _get_client as _http_client
+
 if TYPE_CHECKING:
     from ._legacy import ExtractResult
 
 OCR_PROMPT = "提取这张图片中的所有文字内容，保持原始格式和段落结构，只输出文字不要解释"
+OCR_BATCH_PROMPT = (
+    "下面依次给出 {n} 张图片。请逐张提取图片中的所有文字内容，保持原始格式和段落结构。"
+    "每张图片的文字前单独一行写 ==IMG_序号==（序号从 1 开始），只输出文字不要解释。"
+)
+# Images per generate_content request; larger pages are split into several calls.
+OCR_BATCH_SIZE = 8
+# Markers start a line; markdown decoration around them (**==IMG_1==**,
+# `==IMG_1==`) and text continuing on the marker's own line are tolerated.
+_IMG_MARKER_RE = re.compile(r"^[ \t]*[*_`#>]*[ \t]*==[ \t]*IMG_(\d+)[ \t]*==[*_`]*[ \t]*", re.M)
 VIDEO_TRANSCRIBE_PROMPT = "请完整逐字转录这段音频中的所有语音内容，保持原始表述。"
 VIDEO_FRAME_OCR_PROMPT = (
     "请提取这些视频截图中的所有可见文字，重点关注：工具名称、品牌名、网址、账号名、"
@@ -27,6 +39,12 @@ def _get_client():
     api_key = _get_api_key()
     if not api_key:
         return None
+    return _client_for_key(api_key)
+
+
+@functools.lru_cache(maxsize=1)
+def _client_for_key(api_key: str):
+    # One genai import + client per process instead of one per OCR call
     try:
         from google import genai
 
@@ -42,17 +60,23 @@ def _guess_mime_type(content_type: str) -> str:
 
 
 def _dedupe_blocks(blocks: list[str]) -> list[str]:
-    seen: set[str] = set()
+    # Key on length + a short prefix so long transcripts aren't hashed in full;
+    # prefix collisions fall back to an exact comparison.
+    seen: dict[tuple[int, str], list[str]] = {}
     out: list[str] = []
     for block in blocks:
         text = (block or "").strip()
-        if not text or text in seen:
+        if not text:
+            continue
+        same_prefix = seen.setdefault((len(text), text[:256]), [])
+        if text in same_prefix:
             continue
-        seen.add(text)
+        same_prefix.append(text)
         out.append(text)
     return out
 
 
+@functools.lru_cache(maxsize=1)
 def _ffmpeg_available() -> bool:
     return shutil.which("ffmpeg") is not None
 
@@ -63,37 +87,76 @@ def _get_video_duration(video_url: str) -> float:
         r = subprocess.run(
             ["ffprobe", "-v", "quiet", "-show_entries", "format=duration",
              "-of", "default=noprint_wrappers=1:nokey=1", video_url],
-            capture_output=True, text=True, timeout=10,
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, timeout=10,
         )
         return float(r.stdout.strip())
     except Exception:
         return 30.0
 
 
-def _remote_snapshot(video_url: str, seek_sec: float, output_path: str) -> bool:
-    """从远程视频 URL 直接截取指定时间点的一帧，不下载整个视频"""
+def _remote_snapshot(video_url: str, seek_sec: float) -> bytes:
+    """从远程视频 URL 直接截取指定时间点的一帧（JPEG 字节经管道返回），不下载视频也不落盘"""
     try:
-        subprocess.run(
-            ["ffmpeg", "-y", "-ss", str(seek_sec), "-i", video_url,
-             "-frames:v", "1", "-q:v", "2", output_path],
-            check=True, capture_output=True, timeout=15,
+        r = subprocess.run(
+            ["ffmpeg", "-loglevel", "error", "-ss", str(seek_sec), "-i", video_url,
+             "-frames:v", "1", "-q:v", "2", "-f", "image2pipe", "-vcodec", "mjpeg", "pipe:1"],
+            check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=15,
         )
-        return Path(output_path).exists() and Path(output_path).stat().st_size > 0
+        return r.stdout
     except Exception:
-        return False
+        return b""
 
 
-def _remote_audio_clip(video_url: str, output_path: str, max_seconds: int = 30) -> bool:
-    """从远程视频 URL 提取前 N 秒音频，不下载整个视频"""
+def _remote_audio_clip(video_url: str, max_seconds: int = 30) -> bytes:
+    """从远程视频 URL 提取前 N 秒音频（ogg/opus 字节经管道返回），不下载视频也不落盘"""
     try:
-        subprocess.run(
-            ["ffmpeg", "-y", "-i", video_url, "-vn", "-t", str(max_seconds),
-             "-acodec", "libopus", "-b:a", "32k", output_path],
-            check=True, capture_output=True, timeout=30,
+        r = subprocess.run(
+            ["ffmpeg", "-loglevel", "error", "-i", video_url, "-vn", "-t", str(max_seconds),
+             "-acodec", "libopus", "-b:a", "32k", "-f", "ogg", "pipe:1"],
+            check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=30,
         )
-        return Path(output_path).exists() and Path(output_path).stat().st_size > 0
+        return r.stdout
     except Exception:
-        return False
+        return b""
+
+
+def _split_batch_output(text: str, n: int) -> list[str] | None:
+    """Split a batched OCR answer on its ==IMG_i== markers into n texts.
+
+    Returns None when the markers are not exactly 1..n, so the caller can
+    OCR the images one by one instead of guessing which text is whose. A
+    single image never returns None: there is nobody else the text can belong
+    to, and marker-like text may be part of the image itself.
+    """
+    pieces = _IMG_MARKER_RE.split(text)
+    indices = [int(idx) for idx in pieces[1::2]]
+    if n == 1 and indices != [1]:
+        return [text.strip()]
+    if sorted(indices) != list(range(1, n + 1)):
+        return None
+    out = [""] * n
+    for i, body in zip(indices, pieces[2::2]):
+        out[i - 1] = body.strip()
+    return out
+
+
+def _fetch_images(image_urls: list[str]) -> list[httpx.Response | None]:
+    """Download all images concurrently; failed downloads come back as None.
+
+    Uses the shared pooled client so CDN connections stay alive across calls
+    and are closed with the rest of the pool.
+    """
+    client = _http_client("ocr", mobile=False)
+
+    def _get(url: str) -> httpx.Response | None:
+        try:
+            resp = client.get(url, timeout=20)
+        except httpx.HTTPError:
+            return None
+        return resp if resp.is_success else None
+
+    with ThreadPoolExecutor(max_workers=min(8, len(image_urls))) as pool:
+        return list(pool.map(_get, image_urls))
 
 
 def ocr_images(image_urls: list[str]) -> list[str]:
@@ -106,27 +169,92 @@ def ocr_images(image_urls: list[str]) -> list[str]:
 
     from google.genai import types
 
-    outputs: list[str] = []
-    for image_url in image_urls:
-        try:
-            resp = httpx.get(image_url, timeout=20)
-            resp.raise_for_status()
-            part = types.Part.from_bytes(
+    def _generate(chunk: list[tuple[int, httpx.Response]]) -> str | None:
+        parts = [OCR_PROMPT if len(chunk) == 1 else OCR_BATCH_PROMPT.format(n=len(chunk))]
+        for _, resp in chunk:
+            parts.append(types.Part.from_bytes(
                 data=resp.content,
                 mime_type=_guess_mime_type(resp.headers.get("content-type", "")),
-            )
-            result = client.models.generate_content(
-                model="gemini-2.0-flash",
-                contents=[OCR_PROMPT, part],
-            )
-            outputs.append((getattr(result, "text", "") or "").strip())
+            ))
+        try:
+            result = client.models.generate_content(model="gemini-2.0-flash", contents=parts)
         except Exception:
-            outputs.append("")
+            return None
+        return getattr(result, "text", "") or ""
+
+    def _ocr_single(item: tuple[int, httpx.Response]) -> str:
+        # One plain request per image; its reply is taken as-is, never re-split
+        return (_generate([item]) or "").strip()
+
+    def _ocr_batch(chunk: list[tuple[int, httpx.Response]]) -> list[str]:
+        text = _generate(chunk)
+        if text is None:
+            return [""] * len(chunk)
+        texts = _split_batch_output(text, len(chunk))
+        if texts is None:
+            # Markers missing or garbled: don't guess, OCR each image on its own
+            with ThreadPoolExecutor(max_workers=len(chunk)) as pool:
+                texts = list(pool.map(_ocr_single, chunk))
+        return texts
+
+    fetched = [(i, r) for i, r in enumerate(_fetch_images(image_urls)) if r is not None]
+    batches = [fetched[s:s + OCR_BATCH_SIZE] for s in range(0, len(fetched), OCR_BATCH_SIZE)]
+    if len(batches) > 1:
+        # Pages larger than one batch: the Gemini calls are independent, run them together
+        with ThreadPoolExecutor(max_workers=len(batches)) as pool:
+            batch_texts = list(pool.map(_ocr_batch, batches))
+    else:
+        batch_texts = [_ocr_batch(b) for b in batches]
+
+    outputs = [""] * len(image_urls)
+    for chunk, texts in zip(batches, batch_texts):
+        for (i, _), text in zip(chunk, texts):
+            outputs[i] = text
     return outputs
 
 
-def extract_video_text(video_url: str) -> str:
-    """从视频中提取文字：远程截帧OCR + 语音转文字，不下载完整视频"""
+_SNAP_FRACTIONS = (0.1, 0.35, 0.65, 0.9)
+
+
+def _ocr_frames(client, types, frames: list[bytes]) -> str:
+    """批量 OCR：把所有帧合成一个请求，一次出结果"""
+    if not frames:
+        return ""
+    try:
+        parts = [VIDEO_FRAME_OCR_PROMPT]
+        parts.extend(types.Part.from_bytes(data=f, mime_type="image/jpeg") for f in frames)
+        result = client.models.generate_content(
+            model="gemini-2.0-flash", contents=parts,
+        )
+        return (getattr(result, "text", "") or "").strip()
+    except Exception:
+        warnings.warn("视频关键帧OCR失败，已跳过画面文字部分")
+        return ""
+
+
+def _transcribe_audio(client, types, audio_bytes: bytes) -> str:
+    """语音转文字（音频为前30秒片段）"""
+    if not audio_bytes:
+        return ""
+    try:
+        response = client.models.generate_content(
+            model="gemini-2.0-flash",
+            contents=[
+                types.Part.from_bytes(data=audio_bytes, mime_type="audio/ogg"),
+                VIDEO_TRANSCRIBE_PROMPT,
+            ],
+        )
+        return (getattr(response, "text", "") or "").strip()
+    except Exception:
+        warnings.warn("视频语音转文字失败，已跳过语音部分")
+        return ""
+
+
+def extract_video_text(video_url: str, duration: float = 0) -> str:
+    """从视频中提取文字：远程截帧OCR + 语音转文字，不下载完整视频
+
+    duration 已知（秒）时跳过 ffprobe，少一次远程打开视频。
+    """
     if not video_url:
         return ""
 
@@ -141,54 +269,25 @@ def extract_video_text(video_url: str) -> str:
 
     from google.genai import types
 
-    with tempfile.TemporaryDirectory(prefix="clawkit_video_") as tmpdir:
-        # 1) 获取视频时长，计算截帧时间点
-        duration = _get_video_duration(video_url)
-        # 在 10%、35%、65%、90% 位置各截一帧（4帧，避免片头片尾）
-        snap_points = [duration * p for p in (0.1, 0.35, 0.65, 0.9)]
-
-        # 2) 远程截帧（不下载视频）
-        frame_paths = []
-        for i, sec in enumerate(snap_points):
-            out = str(Path(tmpdir) / f"frame_{i}.jpg")
-            if _remote_snapshot(video_url, sec, out):
-                frame_paths.append(out)
-
-        # 3) 批量 OCR：把所有帧合成一个请求，一次出结果
-        frame_text = ""
-        if frame_paths:
-            try:
-                parts = [VIDEO_FRAME_OCR_PROMPT]
-                for fp in frame_paths:
-                    parts.append(types.Part.from_bytes(
-                        data=Path(fp).read_bytes(), mime_type="image/jpeg"
-                    ))
-                result = client.models.generate_content(
-                    model="gemini-2.0-flash", contents=parts,
-                )
-                frame_text = (getattr(result, "text", "") or "").strip()
-            except Exception:
-                warnings.warn("视频关键帧OCR失败，已跳过画面文字部分")
-
-        # 4) 远程提取音频 + 语音转文字（取前30秒）
-        transcript_text = ""
-        audio_path = str(Path(tmpdir) / "audio.ogg")
-        if _remote_audio_clip(video_url, audio_path):
-            try:
-                audio_bytes = Path(audio_path).read_bytes()
-                response = client.models.generate_content(
-                    model="gemini-2.0-flash",
-                    contents=[
-                        types.Part.from_bytes(data=audio_bytes, mime_type="audio/ogg"),
-                        VIDEO_TRANSCRIBE_PROMPT,
-                    ],
-                )
-                transcript_text = (getattr(response, "text", "") or "").strip()
-            except Exception:
-                warnings.warn("视频语音转文字失败，已跳过语音部分")
-
-        merged = _dedupe_blocks([transcript_text, frame_text])
-        return "\n\n".join(merged).strip()
+    with ThreadPoolExecutor(max_workers=len(_SNAP_FRACTIONS) + 2) as pool:
+        # 音频片段不依赖时长，先于 ffprobe 启动
+        audio_future = pool.submit(_remote_audio_clip, video_url)
+        transcript_future = pool.submit(lambda: _transcribe_audio(client, types, audio_future.result()))
+
+        # 1) 获取视频时长，在 10%、35%、65%、90% 位置各截一帧（避免片头片尾）
+        if duration <= 0:
+            duration = _get_video_duration(video_url)
+        snap_points = [duration * p for p in _SNAP_FRACTIONS]
+
+        # 2) 远程截帧（不下载视频）：各帧 ffmpeg 进程并行执行
+        frames = [f for f in pool.map(lambda sec: _remote_snapshot(video_url, sec), snap_points) if f]
+
+        # 3) 批量 OCR 与语音转文字两个 Gemini 请求同时进行
+        frame_text = _ocr_frames(client, types, frames)
+        transcript_text = transcript_future.result()
+
+    merged = _dedupe_blocks([transcript_text, frame_text])
+    return "\n\n".join(merged).strip()
 
 
 def ocr_and_merge(result: "ExtractResult") -> str:
@@ -197,9 +296,23 @@ def ocr_and_merge(result: "ExtractResult") -> str:
 
     image_urls = [m.url for m in media if getattr(m, "type", "") == "image" and getattr(m, "url", "")]
     video_urls = [m.url for m in media if getattr(m, "type", "") == "video" and getattr(m, "url", "")]
-
-    ocr_texts = [t.strip() for t in ocr_images(image_urls) if t and t.strip()]
-    video_texts = [t.strip() for t in (extract_video_text(url) for url in video_urls) if t and t.strip()]
+    if not (image_urls or video_urls) or _get_client() is None:
+        # Nothing to OCR, or no Gemini: don't spin up ffmpeg / downloads for empty results
+        return description
+
+    # Videos are ffmpeg/Gemini bound and independent of each other and of the
+    # image OCR batch, so all of them run side by side.
+    # The post's own duration describes its video when there is only one
+    known_duration = (result.duration or 0) if len(video_urls) == 1 else 0
+    video_fn = functools.partial(extract_video_text, duration=known_duration) if known_duration else extract_video_text
+
+    with ThreadPoolExecutor(max_workers=min(8, len(video_urls)) + 1) as pool:
+        image_future = pool.submit(ocr_images, image_urls)
+        video_results = list(pool.map(video_fn, video_urls))
+        image_results = image_future.result()
+
+    ocr_texts = [t.strip() for t in image_results if t and t.strip()]
+    video_texts = [t.strip() for t in video_results if t and t.strip()]
 
     chunks = _dedupe_blocks([description, *ocr_texts, *video_texts])
     return "\n\n".join(chunks).strip()
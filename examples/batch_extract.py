@@ -8,9 +8,11 @@
 用法:
     uv run --with requests examples/batch_extract.py links.txt
     uv run --with requests examples/batch_extract.py links.txt --json --output results/
+    uv run --with requests examples/batch_extract.py links.txt --concurrency 4
 """
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from clawkit import extract, format_result, download_media
@@ -24,6 +26,7 @@ def main():
     parser.add_argument("--json", "-j", action="store_true", help="JSON 输出")
     parser.add_argument("--output", "-o", help="结果输出目录")
     parser.add_argument("--download", "-d", action="store_true", help="同时下载媒体")
+    parser.add_argument("--concurrency", "-c", type=int, default=8, help="并发提取数（默认 8）")
     args = parser.parse_args()
 
     with open(args.file) as f:
@@ -34,28 +37,42 @@ def main():
 
     print(f"📋 共 {len(urls)} 个链接\n", file=sys.stderr)
 
+    # 提取以网络等待为主，放进线程池并发；按提交顺序取结果，输出顺序与文件一致。
+    # 下载受带宽限制，单独用一个池，不占用提取的并发名额。
     results = []
-    for i, url in enumerate(urls, 1):
-        print(f"[{i}/{len(urls)}] {url[:60]}...", file=sys.stderr)
-        try:
-            result = extract(url)
-            results.append(result)
-
-            if args.json:
-                print(json.dumps(result.to_dict(), ensure_ascii=False))
-            else:
-                print(format_result(result))
-
-            if args.output:
-                fname = f"{result.platform}_{result.raw_id or i}.json"
-                with open(os.path.join(args.output, fname), "w") as f:
-                    json.dump(result.to_dict(), f, ensure_ascii=False, indent=2)
-
-            if args.download:
-                download_media(result, args.output or "./downloads")
-
-        except Exception as e:
-            print(f"  ❌ {e}", file=sys.stderr)
+    workers = max(1, args.concurrency)
+    with ThreadPoolExecutor(max_workers=workers) as pool, \
+            ThreadPoolExecutor(max_workers=workers) as download_pool:
+        futures = [(i, url, pool.submit(extract, url)) for i, url in enumerate(urls, 1)]
+        downloads = []
+        for i, url, future in futures:
+            print(f"[{i}/{len(urls)}] {url[:60]}...", file=sys.stderr)
+            try:
+                result = future.result()
+                results.append(result)
+
+                if args.json:
+                    print(json.dumps(result.to_dict(), ensure_ascii=False))
+                else:
+                    print(format_result(result))
+
+                if args.output:
+                    fname = f"{result.platform}_{result.raw_id or i}.json"
+                    with open(os.path.join(args.output, fname), "w") as f:
+                        json.dump(result.to_dict(), f, ensure_ascii=False, indent=2)
+
+                if args.download:
+                    downloads.append((url, download_pool.submit(
+                        download_media, result, args.output or "./downloads")))
+
+            except Exception as e:
+                print(f"  ❌ {e}", file=sys.stderr)
+
+        for url, future in downloads:
+            try:
+                future.result()
+            except Exception as e:
+                print(f"  ❌ 下载失败 {url[:60]}: {e}", file=sys.stderr)
 
     print(f"\n✅ 完成: {len(results)}/{len(urls)} 成功", file=sys.stderr)
 
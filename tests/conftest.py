@@ -1,5 +1,8 @@
 import json
+import sys
+import types
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Any
 
 import httpx
@@ -77,6 +80,35 @@ def make_extract_result():
     return _make
 
 
+@pytest.fixture
+def fake_gemini(monkeypatch):
+    """Install a fake google.genai + Gemini client for clawkit.ocr.
+
+    ``reply(images)`` gets the image payloads of one generate_content call and
+    returns its text. Images are fetched as ``url.encode()`` unless ``fetch``
+    is given. Returns the list of recorded ``contents``.
+    """
+    def _install(reply, fetch=None) -> list:
+        calls = []
+
+        class _Model:
+            def generate_content(self, model, contents):
+                calls.append(contents)
+                return SimpleNamespace(text=reply(contents[1:]))
+
+        fake_genai = types.ModuleType("google.genai")
+        fake_genai.types = SimpleNamespace(Part=SimpleNamespace(from_bytes=lambda data, mime_type: data))
+        monkeypatch.setitem(sys.modules, "google", types.ModuleType("google"))
+        monkeypatch.setitem(sys.modules, "google.genai", fake_genai)
+        monkeypatch.setattr("clawkit.ocr._get_client", lambda: SimpleNamespace(models=_Model()))
+        monkeypatch.setattr(
+            "clawkit.ocr._fetch_images",
+            fetch or (lambda urls: [SimpleNamespace(content=u.encode(), headers={}) for u in urls]),
+        )
+        return calls
+    return _install
+
+
 class MockHTTPXClient:
     def __init__(self, routes: dict[tuple[str, str], httpx.Response] | None = None):
         self.routes = routes or {}
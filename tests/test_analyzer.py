@@ -5,6 +5,14 @@ import pytest
 
 from clawkit.analyzer import analyze_content
 
+LONG_TEXT = "这是一篇关于时间管理的长文，介绍了三个可以马上落地的方法，并附有作者自己的实践数据。"
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr("clawkit.analyzer.CACHE_PATH", tmp_path / "analysis.db")
+    monkeypatch.setattr("clawkit.analyzer._memory_cache", {})
+
 
 @pytest.mark.unit
 class Describe_analyze_content:
@@ -31,7 +39,50 @@ class Describe_analyze_content:
         fake_google.genai = types.SimpleNamespace(Client=FakeClient)
         monkeypatch.setitem(sys.modules, "google", fake_google)
 
-        out = analyze_content("内容", "xiaohongshu", {})
+        out = analyze_content(LONG_TEXT, "xiaohongshu", {})
         assert out["content_type"] == "教程"
         assert out["key_points"] == ["要点1"]
         assert out["summary"] == "一句话"
+
+    def test_should_skip_model_call_for_short_text(self, monkeypatch):
+        def _no_call():
+            raise AssertionError("短文本不应进入模型调用流程")
+
+        monkeypatch.setattr("clawkit.analyzer._get_api_key", _no_call)
+        out = analyze_content("太短了", "weibo", {})
+        assert out["summary"] == ""
+
+    def test_should_reuse_cached_analysis_for_same_text(self, monkeypatch):
+        monkeypatch.setattr("clawkit.analyzer._get_api_key", lambda: "k")
+        calls = {"n": 0}
+
+        class FakeResp:
+            text = '{"content_type":"资讯","key_points":["a"]}'
+
+        class FakeClient:
+            def __init__(self, api_key):
+                self.models = self
+
+            def generate_content(self, model, contents):
+                calls["n"] += 1
+                return FakeResp()
+
+        fake_google = types.ModuleType("google")
+        fake_google.genai = types.SimpleNamespace(Client=FakeClient)
+        monkeypatch.setitem(sys.modules, "google", fake_google)
+
+        first = analyze_content(LONG_TEXT, "weibo", {"likes": 1})
+        first["key_points"].append("mutated")
+        # Memory cache cleared: second hit must come from the on-disk cache
+        monkeypatch.setattr("clawkit.analyzer._memory_cache", {})
+        second = analyze_content(LONG_TEXT, "weibo", {"likes": 1})
+        assert calls["n"] == 1
+        assert second["content_type"] == "资讯" and second["key_points"] == ["a"]
+
+    def test_should_extract_first_json_object_from_prose(self):
+        from clawkit.analyzer import _extract_json
+
+        text = '分析如下 {"summary": "含 } 括号", "key_points": [{"a": 1}]} 以上 {"x": 2}'
+        assert _extract_json(text) == {"summary": "含 } 括号", "key_points": [{"a": 1}]}
+        assert _extract_json("{not json} 然后 {\"ok\": true}") == {"ok": True}
+        assert _extract_json("没有 JSON") == {}
@@ -1,3 +1,6 @@
+import asyncio
+import sys
+import types
 from pathlib import Path
 
 import pytest
@@ -27,3 +30,133 @@ class Describe_CookieManager:
         monkeypatch.setattr(Path, "home", lambda: tmp_path)
         cm = auth.CookieManager()
         assert cm.get_cookies("zhihu") is None
+
+    def test_should_replace_file_atomically_and_skip_unchanged(self, monkeypatch, tmp_path):
+        """保存应通过临时文件原子替换，内容未变时不重写。"""
+        monkeypatch.setattr(auth.CookieManager, "COOKIE_DIR", tmp_path)
+        monkeypatch.setattr(auth.CookieManager, "COOKIE_FILE", tmp_path / "cookies.json")
+        cm = auth.CookieManager()
+        cm._data["zhihu"] = {"cookies": {"z_c0": "1"}}
+        cm._save()
+        inode = (tmp_path / "cookies.json").stat().st_ino
+        cm._save()
+        assert (tmp_path / "cookies.json").stat().st_ino == inode
+        assert not list(tmp_path.glob(".cookies.*.tmp"))
+        assert auth.CookieManager().get_cookies("zhihu") == {"z_c0": "1"}
+
+    def test_should_share_one_manager_per_process(self, monkeypatch, tmp_path):
+        """get_manager 应返回同一个实例。"""
+        monkeypatch.setattr(auth.CookieManager, "COOKIE_DIR", tmp_path)
+        monkeypatch.setattr(auth.CookieManager, "COOKIE_FILE", tmp_path / "cookies.json")
+        auth.get_manager.cache_clear()
+        try:
+            assert auth.get_manager() is auth.get_manager()
+        finally:
+            auth.get_manager.cache_clear()
+
+    def test_should_refresh_auth_status_after_save(self, monkeypatch, tmp_path):
+        """登录状态应缓存，保存新 cookie 后立即失效。"""
+        monkeypatch.setattr(auth.CookieManager, "COOKIE_DIR", tmp_path)
+        monkeypatch.setattr(auth.CookieManager, "COOKIE_FILE", tmp_path / "cookies.json")
+        cm = auth.CookieManager()
+        assert cm.is_authenticated("weibo") is False
+        cm._data["weibo"] = {"cookies": {"SUB": "abc"}}
+        assert cm.is_authenticated("weibo") is False  # still cached
+        cm._save()
+        assert cm.is_authenticated("weibo") is True
+
+    def test_should_follow_hand_edited_cookies_in_header(self, monkeypatch, tmp_path):
+        """手动编辑 cookies.json 后，Cookie 头应随之更新且不写回文件。"""
+        monkeypatch.setattr(auth.CookieManager, "COOKIE_DIR", tmp_path)
+        monkeypatch.setattr(auth.CookieManager, "COOKIE_FILE", tmp_path / "cookies.json")
+        (tmp_path / "cookies.json").write_text(
+            '{"weibo": {"cookies": {"SUB": "old"}, "cookie_header": "SUB=stale"}}'
+        )
+        cm = auth.CookieManager()
+        assert cm.get_cookie_header("weibo") == "SUB=old"
+        cm._data["weibo"]["cookies"]["SUB"] = "new"
+        assert cm.get_cookie_header("weibo") == "SUB=new"
+        cm._save()
+        assert "cookie_header" not in (tmp_path / "cookies.json").read_text()
+
+
+class _FakePage:
+    main_frame = None
+
+    def on(self, event, handler):
+        pass
+
+    async def goto(self, url, **kwargs):
+        pass
+
+    async def evaluate(self, expr):
+        return "fake-ua"
+
+
+class _FakeContext:
+    def __init__(self, log):
+        self.log = log
+
+    def on(self, event, handler):
+        pass
+
+    async def new_page(self):
+        return _FakePage()
+
+    async def cookies(self):
+        return [{"name": n, "value": "v", "domain": ".x"} for n in ("SUB", "z_c0")]
+
+    async def close(self):
+        self.log.append("ctx.close")
+
+
+class _FakeBrowser:
+    def __init__(self, log):
+        self.log = log
+
+    async def new_context(self, **kwargs):
+        self.log.append("new_context")
+        return _FakeContext(self.log)
+
+    async def close(self):
+        self.log.append("browser.close")
+
+
+def _install_fake_playwright(monkeypatch, log):
+    class _Chromium:
+        async def launch(self, **kwargs):
+            log.append("launch")
+            return _FakeBrowser(log)
+
+    class _Playwright:
+        chromium = _Chromium()
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    async_api = types.ModuleType("playwright.async_api")
+    async_api.async_playwright = _Playwright
+    monkeypatch.setitem(sys.modules, "playwright", types.ModuleType("playwright"))
+    monkeypatch.setitem(sys.modules, "playwright.async_api", async_api)
+
+
+@pytest.mark.unit
+class Describe_CookieManager_login_all:
+    def test_should_launch_browser_once_for_all_platforms(self, monkeypatch, tmp_path):
+        """多平台登录应只启动一次浏览器，每个平台独立 context。"""
+        log = []
+        _install_fake_playwright(monkeypatch, log)
+        monkeypatch.setattr(auth.CookieManager, "COOKIE_DIR", tmp_path)
+        monkeypatch.setattr(auth.CookieManager, "COOKIE_FILE", tmp_path / "cookies.json")
+
+        monkeypatch.setattr("clawkit.auth.LOGIN_RECHECK_INTERVAL", 0.01)
+        cm = auth.CookieManager()
+        out = asyncio.run(cm.login_all(["weibo", "zhihu"]))
+        assert out == {"weibo": True, "zhihu": True}
+        assert log.count("launch") == 1 and log.count("new_context") == 2
+        assert log[-1] == "browser.close"
+        assert auth.CookieManager().get_cookies("zhihu")["z_c0"] == "v"
+        assert cm.get_cookie_header("weibo") == "SUB=v; z_c0=v"
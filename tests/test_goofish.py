@@ -29,3 +29,18 @@ class Describe_GoofishExtractor:
         monkeypatch.setattr(clawkit, "_release_client", lambda *a, **k: None)
         r = clawkit.GooFishExtractor().extract("https://2.taobao.com/item.htm?id=1")
         assert r.platform == "goofish"
+
+    def test_should_extract_products_from_jsonld_only(self):
+        """HTML 回退应只解析 Product 类型的 JSON-LD。"""
+        page = (
+            '<script type="application/ld+json">{"@type": "BreadcrumbList", "name": "x"}</script>'
+            '<script type="application/ld+json">{"@type": "Product", "name": "相机", "offers": {"price": 12}}</script>'
+        )
+        out = clawkit.GooFishExtractor()._extract_from_html(page)
+        assert len(out) == 1 and out[0]["title"] == "相机" and out[0]["price"] == "12"
+
+    def test_should_tolerate_offers_list_in_jsonld(self):
+        """offers 为数组时不应报错，价格留空。"""
+        page = '<script type="application/ld+json">[{"@type": "Product", "name": "镜头", "offers": [{"price": 5}]}]</script>'
+        out = clawkit.GooFishExtractor()._extract_from_html(page)
+        assert out[0]["title"] == "镜头" and out[0]["price"] == ""
@@ -21,6 +21,13 @@ class Describe_safe_int:
         """给定浮点数时，应按 int 规则截断。"""
         assert clawkit._safe_int(12.9) == 12
 
+    def test_given_display_count_should_expand_units(self):
+        """万/亿、千分位和 + 号形式的计数应展开为整数。"""
+        assert clawkit._safe_int("1.2万") == 12000
+        assert clawkit._safe_int("3,456") == 3456
+        assert clawkit._safe_int("10万+") == 100000
+        assert clawkit._safe_int("abc") == 0
+
 
 @pytest.mark.unit
 class Describe_fmt_num:
@@ -71,19 +78,54 @@ class Describe_detect_platform:
         with pytest.raises(ValueError):
             clawkit.detect_platform("https://example.org")
 
+    def test_should_match_host_labels_not_substrings(self):
+        """按主机名标签匹配：子域名命中，仅包含相同后缀字符的域名不命中。"""
+        assert clawkit.detect_platform("https://zhuanlan.zhihu.com/p/1") == "zhihu"
+        assert clawkit.detect_platform("https://nitter.net/a/status/1") == "twitter"
+        assert clawkit.detect_platform("https://2.taobao.com/item.htm?id=1") == "goofish"
+        with pytest.raises(ValueError):
+            clawkit.detect_platform("https://box.com/a?ref=douyin.com")
+
+
+@pytest.mark.unit
+class Describe_get_extractor:
+    def test_should_construct_once_and_reuse(self):
+        """同一平台多次获取时，应复用同一个提取器实例。"""
+        first = clawkit.get_extractor("weibo")
+        assert isinstance(first, clawkit.WeiboExtractor)
+        assert clawkit.get_extractor("weibo") is first
+
+    def test_should_keep_extractors_mapping(self):
+        """clawkit.EXTRACTORS 应继续可用，并与 get_extractor 共享实例。"""
+        assert isinstance(clawkit.EXTRACTORS["douyin"], clawkit.DouyinExtractor)
+        assert clawkit.EXTRACTORS["douyin"] is clawkit.get_extractor("douyin")
+        assert "weibo" in clawkit.EXTRACTORS and "nope" not in clawkit.EXTRACTORS
+        with pytest.raises(KeyError):
+            clawkit.EXTRACTORS["nope"]
+
 
 @pytest.mark.unit
 class Describe_rate_limit:
     def test_should_enforce_minimum_interval(self, monkeypatch):
         """应在连续请求时触发最小间隔等待。"""
         sleeps = []
-        monkeypatch.setattr(clawkit._time, "time", lambda: 0.1)
+        monkeypatch.setattr(clawkit._time, "monotonic", lambda: 0.1)
         monkeypatch.setattr(clawkit._time, "sleep", lambda s: sleeps.append(s))
-        clawkit._last_request.clear()
-        clawkit._last_request["t"] = 0.0
+        clawkit._next_request.clear()
+        clawkit._next_request["t"] = 0.5  # previous request at t=0.0
         clawkit._rate_limit("t", min_interval=0.5)
         assert sleeps and sleeps[0] == pytest.approx(0.4)
 
+    def test_should_space_concurrent_callers_apart(self, monkeypatch):
+        """同一时刻的多个调用应依次排开，而不是同时放行。"""
+        sleeps = []
+        monkeypatch.setattr(clawkit._time, "monotonic", lambda: 10.0)
+        monkeypatch.setattr(clawkit._time, "sleep", lambda s: sleeps.append(s))
+        clawkit._next_request.clear()
+        for _ in range(3):
+            clawkit._rate_limit("t", min_interval=0.5)
+        assert sleeps == [pytest.approx(0.5), pytest.approx(1.0)]
+
 
 @pytest.mark.unit
 class Describe_get_cookies:
@@ -93,6 +135,53 @@ class Describe_get_cookies:
         monkeypatch.setattr(clawkit, "_cookies_store", {})
         assert clawkit._get_cookies("weibo") == {}
 
+    def test_should_serve_stale_while_reloading(self, monkeypatch):
+        """过期后先返回旧值，并在后台重新加载 cookie 文件。"""
+        clawkit._cookie_cache.clear()
+        store = {"weibo": {"cookies": {"SUB": "old"}}}
+        monkeypatch.setattr(clawkit, "_cookies_store", store)
+        monkeypatch.setattr("clawkit._legacy._cookies_store", store)
+        monkeypatch.setattr("clawkit._legacy._load_cookies", lambda: {"weibo": {"SUB": "new"}})
+        now = {"t": 1000.0}
+        monkeypatch.setattr(clawkit._time, "monotonic", lambda: now["t"])
+        started = []
+
+        class _Thread:
+            def __init__(self, target, args, daemon):
+                self.run = lambda: target(*args)
+
+            def start(self):
+                started.append(self)
+
+        monkeypatch.setattr("clawkit._legacy.threading.Thread", _Thread)
+        assert clawkit._get_cookies("weibo") == {"SUB": "old"}
+        now["t"] += clawkit.COOKIE_TTL + 1
+        assert clawkit._get_cookies("weibo") == {"SUB": "old"}
+        assert clawkit._get_cookies("weibo") == {"SUB": "old"}
+        assert len(started) == 1
+        started[0].run()
+        assert clawkit._get_cookies("weibo") == {"SUB": "new"}
+        clawkit._cookie_cache.clear()
+
+    def test_should_keep_cookies_when_reload_fails(self, monkeypatch, tmp_path):
+        """cookie 文件损坏时后台重载应保留旧 cookie，只重新计时。"""
+        clawkit._cookie_cache.clear()
+        store = {"weibo": {"cookies": {"SUB": "old"}}, "zhihu": {"z_c0": "z"}}
+        monkeypatch.setattr(clawkit, "_cookies_store", store)
+        monkeypatch.setattr("clawkit._legacy._cookies_store", store)
+        (tmp_path / ".clawkit").mkdir()
+        (tmp_path / ".clawkit" / "cookies.json").write_text('{"weibo": ')
+        monkeypatch.setattr(clawkit.Path, "home", lambda: tmp_path)
+        assert clawkit._load_cookies() is None
+        now = {"t": 1000.0}
+        monkeypatch.setattr(clawkit._time, "monotonic", lambda: now["t"])
+        clawkit._get_cookies("weibo")
+        now["t"] += clawkit.COOKIE_TTL + 1
+        clawkit._refresh_cookies("weibo", store)
+        assert store["zhihu"] == {"z_c0": "z"}
+        assert clawkit._cookie_cache["weibo"] == ({"SUB": "old"}, now["t"] + clawkit.COOKIE_TTL, now["t"] + 2 * clawkit.COOKIE_TTL)
+        clawkit._cookie_cache.clear()
+
 
 @pytest.mark.unit
 class Describe_release_client:
@@ -102,6 +191,13 @@ class Describe_release_client:
         clawkit._release_client(c)
         assert c.is_closed
 
+    def test_should_keep_pooled_client_open(self):
+        """连接池客户端释放后应保持打开，供下次复用。"""
+        c = clawkit._get_client("release-test")
+        clawkit._release_client(c)
+        assert not c.is_closed
+        assert clawkit._client(platform="release-test") is c
+
 
 @pytest.mark.unit
 class Describe_cached_trending:
@@ -128,8 +224,76 @@ class Describe_cached_trending:
             calls["n"] += 1
             return [calls["n"]]
 
-        t = iter([1000, 1301])
+        t = iter([1000, 1361])
         monkeypatch.setattr(clawkit.time, "time", lambda: next(t))
         clawkit._cached_trending("x", fetch)
         out = clawkit._cached_trending("x", fetch)
         assert out == [2]
+
+    def test_should_jitter_expiry_within_ttl_range(self, monkeypatch):
+        """每个条目的过期时间应落在 TTL 区间内，固定 TTL 时精确生效。"""
+        clawkit._trending_cache.clear()
+        monkeypatch.setattr(clawkit.time, "time", lambda: 1000)
+        lo, hi = clawkit.TRENDING_TTL
+        for key in "abcde":
+            clawkit._cached_trending(key, lambda: [])
+            assert 1000 + lo <= clawkit._trending_cache[key][0] <= 1000 + hi
+        clawkit._cached_trending("fixed", lambda: [], ttl=60)
+        assert clawkit._trending_cache["fixed"][0] == 1060
+
+
+@pytest.mark.unit
+class Describe_batch_extract:
+    def test_should_keep_file_order_with_concurrency(self, monkeypatch, tmp_path, capsys):
+        """并发执行时结果仍应按文件顺序返回。"""
+        import time as _t
+
+        links = tmp_path / "links.txt"
+        links.write_text("# comment\nhttps://a/1\n\nhttps://a/2\nhttps://a/3\n")
+
+        def fake_extract(url):
+            # Later links finish first
+            _t.sleep(0.03 * (4 - int(url[-1])))
+            return clawkit.ExtractResult(platform="x", url=url, raw_id=url[-1])
+
+        monkeypatch.setattr("clawkit._legacy.extract", fake_extract)
+        out = clawkit.batch_extract(str(links), fmt="brief", concurrency=3)
+        assert [r.url for r in out] == ["https://a/1", "https://a/2", "https://a/3"]
+
+    def test_should_emit_same_json_to_stdout_and_files(self, monkeypatch, tmp_path, capsys):
+        """--json 与 --output 同时开启时，汇总数组与单文件内容应一致。"""
+        import json
+
+        links = tmp_path / "links.txt"
+        links.write_text("https://a/1\nhttps://a/2\n")
+        monkeypatch.setattr(
+            "clawkit._legacy.extract",
+            lambda url: clawkit.ExtractResult(platform="x", url=url, raw_id=url[-1], title="标题"),
+        )
+        out_dir = tmp_path / "out"
+        clawkit.batch_extract(str(links), as_json=True, output_dir=str(out_dir))
+        printed = json.loads(capsys.readouterr().out)
+        assert [d["url"] for d in printed] == ["https://a/1", "https://a/2"]
+        assert json.loads((out_dir / "x_2.json").read_text()) == printed[1]
+
+
+@pytest.mark.unit
+class Describe_download_media:
+    def test_should_stream_media_to_files_in_order(self, monkeypatch, tmp_path, capsys):
+        """应将媒体流式写入文件，并按媒体顺序返回路径，失败项跳过。"""
+        def handler(request):
+            if request.url.path == "/bad.jpg":
+                return clawkit.httpx.Response(404)
+            return clawkit.httpx.Response(200, content=request.url.path.encode() * 100)
+
+        client = clawkit.httpx.Client(transport=clawkit.httpx.MockTransport(handler))
+        monkeypatch.setattr("clawkit._legacy._client", lambda *a, **k: client)
+        result = clawkit.ExtractResult(platform="weibo", raw_id="9", media=[
+            clawkit.MediaItem(url="https://img/a.jpg", type="image"),
+            clawkit.MediaItem(url="https://img/bad.jpg", type="image"),
+            clawkit.MediaItem(url="https://img/c.jpg", type="image"),
+        ])
+        paths = clawkit.download_media(result, str(tmp_path))
+        assert [p.rsplit("/", 1)[-1] for p in paths] == ["weibo_9_0.jpg", "weibo_9_2.jpg"]
+        assert (tmp_path / "weibo_9_0.jpg").read_bytes() == b"/a.jpg" * 100
+        assert not (tmp_path / "weibo_9_1.jpg").exists()
@@ -1,9 +1,10 @@
 from types import SimpleNamespace
 
+import httpx
 import pytest
 
 import clawkit
-from clawkit.ocr import extract_video_text, ocr_and_merge
+from clawkit.ocr import extract_video_text, ocr_and_merge, ocr_images
 
 
 @pytest.mark.unit
@@ -17,6 +18,7 @@ class Describe_ocr_and_merge:
             ],
         )
 
+        monkeypatch.setattr("clawkit.ocr._get_client", lambda: object())
         monkeypatch.setattr("clawkit.ocr.ocr_images", lambda urls: ["图1文字", "图2文字"])
         monkeypatch.setattr("clawkit.ocr.extract_video_text", lambda url: "")
 
@@ -31,6 +33,14 @@ class Describe_ocr_and_merge:
         monkeypatch.setattr("clawkit.ocr.extract_video_text", lambda url: "")
         assert ocr_and_merge(result) == "只有描述"
 
+    def test_should_skip_ocr_without_gemini_client(self, monkeypatch):
+        result = clawkit.ExtractResult(
+            description="描述", media=[clawkit.MediaItem(url="https://img/1.jpg", type="image")]
+        )
+        monkeypatch.setattr("clawkit.ocr._get_client", lambda: None)
+        monkeypatch.setattr("clawkit.ocr.ocr_images", lambda urls: pytest.fail("不应调用 OCR"))
+        assert ocr_and_merge(result) == "描述"
+
     def test_ocr_and_merge_with_video_media(self, monkeypatch):
         result = clawkit.ExtractResult(
             description="笔记描述",
@@ -40,6 +50,7 @@ class Describe_ocr_and_merge:
             ],
         )
 
+        monkeypatch.setattr("clawkit.ocr._get_client", lambda: object())
         monkeypatch.setattr("clawkit.ocr.ocr_images", lambda urls: ["图片OCR文字"])
         monkeypatch.setattr("clawkit.ocr.extract_video_text", lambda url: "视频语音\n\n画面品牌: TEST")
 
@@ -59,29 +70,21 @@ def test_extract_video_text_with_mock(monkeypatch, tmp_path):
             self.text = text
 
     class _MockModel:
-        def __init__(self):
-            self.calls = 0
-
         def generate_content(self, model, contents):
-            self.calls += 1
-            # First call = frame OCR (batch), second = audio transcription
-            if self.calls == 1:
-                return _MockResp("SOON AI游戏引擎 v1.0.2")
-            return _MockResp("这是语音转写内容")
+            # Frame OCR and audio transcription run concurrently; tell them apart by prompt
+            if clawkit.ocr.VIDEO_TRANSCRIBE_PROMPT in contents:
+                return _MockResp("这是语音转写内容")
+            return _MockResp("SOON AI游戏引擎 v1.0.2")
 
     mock_client = SimpleNamespace(models=_MockModel())
     monkeypatch.setattr("clawkit.ocr._get_client", lambda: mock_client)
     monkeypatch.setattr("clawkit.ocr._get_video_duration", lambda url: 20.0)
 
-    def _fake_snapshot(video_url, seek_sec, output_path):
-        with open(output_path, "wb") as f:
-            f.write(b"fake-jpeg")
-        return True
+    def _fake_snapshot(video_url, seek_sec):
+        return b"fake-jpeg"
 
-    def _fake_audio_clip(video_url, output_path, max_seconds=30):
-        with open(output_path, "wb") as f:
-            f.write(b"fake-audio")
-        return True
+    def _fake_audio_clip(video_url, max_seconds=30):
+        return b"fake-audio"
 
     monkeypatch.setattr("clawkit.ocr._remote_snapshot", _fake_snapshot)
     monkeypatch.setattr("clawkit.ocr._remote_audio_clip", _fake_audio_clip)
@@ -89,3 +92,141 @@ def test_extract_video_text_with_mock(monkeypatch, tmp_path):
     merged = extract_video_text("https://video/test.mp4")
     assert "语音转写" in merged
     assert "SOON" in merged
+
+
+def _marked(images) -> str:
+    return "\n".join(f"==IMG_{k}==\n{b.decode()}" for k, b in enumerate(images, 1))
+
+
+@pytest.mark.unit
+def test_ocr_images_batches_into_one_request(fake_gemini):
+    def _fake_fetch(urls):
+        ok = lambda body: SimpleNamespace(content=body, headers={"content-type": "image/png"})
+        return [ok(b"a"), None, ok(b"c")]
+
+    calls = fake_gemini(lambda images: "==IMG_1==\n第一张\n==IMG_2==\n第二张", fetch=_fake_fetch)
+
+    out = ocr_images(["https://img/1", "https://img/bad", "https://img/3"])
+    assert out == ["第一张", "", "第二张"]
+    assert len(calls) == 1 and calls[0][1:] == [b"a", b"c"]
+
+
+@pytest.mark.unit
+def test_ocr_images_splits_large_pages_into_aligned_batches(fake_gemini, monkeypatch):
+    fake_gemini(lambda images: images[0].decode() if len(images) == 1 else _marked(images))
+    monkeypatch.setattr("clawkit.ocr.OCR_BATCH_SIZE", 2)
+
+    urls = [f"img{k}" for k in range(5)]
+    assert ocr_images(urls) == urls
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("text", [
+    "==IMG_1== 第一张\n==IMG_2== 第二张",
+    "**==IMG_1==**\n第一张\n**==IMG_2==**\n第二张",
+    "以下是结果：\n`==IMG_1==`\n第一张\n\n`==IMG_2==`\n第二张",
+])
+def test_split_batch_output_accepts_decorated_markers(text):
+    from clawkit.ocr import _split_batch_output
+
+    assert _split_batch_output(text, 2) == ["第一张", "第二张"]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("text", ["第一张\n第二张", "==IMG_1==\n第一张", "==IMG_1==\na\n==IMG_1==\nb"])
+def test_split_batch_output_rejects_mismatched_markers(text):
+    from clawkit.ocr import _split_batch_output
+
+    assert _split_batch_output(text, 2) is None
+
+
+@pytest.mark.unit
+def test_ocr_images_falls_back_to_single_images_without_markers(fake_gemini):
+    calls = fake_gemini(lambda images: "\n".join(b.decode() for b in images))
+
+    assert ocr_images(["甲", "乙"]) == ["甲", "乙"]
+    assert len(calls) == 3
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("reply", ["==IMG_1==\n截图\n==IMG_1==\n正文", "==IMG_2==\n截图里的标记"])
+def test_ocr_images_single_image_with_stray_marker_makes_one_call(fake_gemini, reply):
+    calls = fake_gemini(lambda images: reply)
+
+    assert ocr_images(["https://img/1"]) == [reply]
+    assert len(calls) == 1
+
+
+@pytest.mark.unit
+def test_ocr_images_fallback_does_not_resplit_single_replies(fake_gemini):
+    # Batch reply has no markers; each single-image reply contains a stray one
+    calls = fake_gemini(lambda images: "无标记" if len(images) > 1 else "==IMG_3==\n" + images[0].decode())
+
+    assert ocr_images(["甲", "乙"]) == ["==IMG_3==\n甲", "==IMG_3==\n乙"]
+    assert len(calls) == 3
+
+
+@pytest.mark.unit
+def test_split_batch_output_ignores_markers_mid_line():
+    from clawkit.ocr import _split_batch_output
+
+    text = "==IMG_1==\n见 ==IMG_2== 字样\n==IMG_2==\n第二张"
+    assert _split_batch_output(text, 2) == ["见 ==IMG_2== 字样", "第二张"]
+
+
+@pytest.mark.unit
+def test_ocr_images_full_batch_survives_garbled_markers(fake_gemini):
+    from clawkit.ocr import OCR_BATCH_SIZE
+
+    def _reply(images):
+        if len(images) == 1:
+            return images[0].decode()
+        # One marker dropped: the whole batch must be re-read image by image
+        return "\n".join(f"==IMG_{k}==\n{b.decode()}" for k, b in enumerate(images[1:], 2))
+
+    fake_gemini(_reply)
+
+    urls = [f"img{k}" for k in range(OCR_BATCH_SIZE)]
+    assert ocr_images(urls) == urls
+
+
+@pytest.mark.unit
+def test_fetch_images_reuses_pooled_client(monkeypatch):
+    def handler(request):
+        if request.url.path == "/bad":
+            return httpx.Response(404)
+        return httpx.Response(200, content=request.url.path.encode())
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr("clawkit.ocr._http_client", lambda *a, **k: client)
+    from clawkit.ocr import _fetch_images
+
+    out = _fetch_images(["https://img/a", "https://img/bad", "https://img/c"])
+    assert [r.content if r else None for r in out] == [b"/a", None, b"/c"]
+
+
+@pytest.mark.unit
+def test_dedupe_blocks_keeps_long_blocks_sharing_prefix():
+    from clawkit.ocr import _dedupe_blocks
+
+    head = "标题" * 200
+    assert _dedupe_blocks([head + "甲", " " + head + "甲 ", head + "乙", "", None]) == [head + "甲", head + "乙"]
+
+
+@pytest.mark.unit
+def test_ocr_and_merge_passes_known_duration(monkeypatch):
+    result = clawkit.ExtractResult(
+        description="描述", duration=42,
+        media=[clawkit.MediaItem(url="https://video/1.mp4", type="video")],
+    )
+    seen = {}
+
+    def _fake_video_text(url, duration=0):
+        seen["duration"] = duration
+        return "画面文字"
+
+    monkeypatch.setattr("clawkit.ocr._get_client", lambda: object())
+    monkeypatch.setattr("clawkit.ocr.ocr_images", lambda urls: [])
+    monkeypatch.setattr("clawkit.ocr.extract_video_text", _fake_video_text)
+    assert ocr_and_merge(result) == "描述\n\n画面文字"
+    assert seen["duration"] == 42
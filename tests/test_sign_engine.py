@@ -1,6 +1,7 @@
 import pytest
 
 import sign_engine
+from clawkit import sign_engine as _se
 
 
 @pytest.mark.unit
@@ -18,6 +19,33 @@ class Describe_sign_douyin:
         assert isinstance(s1, str) and isinstance(s2, str)
         assert len(s1) == len(s2)
 
+    def test_should_reuse_abogus_per_user_agent(self):
+        """同一 UA 复用同一个 _ABogus，不同 UA 各自构造。"""
+        assert _se._abogus_for("UA/1") is _se._abogus_for("UA/1")
+        assert _se._abogus_for("UA/1") is not _se._abogus_for("UA/2")
+
+
+@pytest.mark.unit
+class Describe_sm3:
+    def test_should_match_standard_vector_on_both_backends(self, monkeypatch):
+        """原生与纯 Python SM3 都应符合标准测试向量。"""
+        expected = "66c7f0f462eeedd9d1f2d46bdc10e4e24167c4875cf2f7a2297da02b8f4ba8e0"
+        assert bytes(_se._sm3_hash(b"abc")).hex() == expected
+        monkeypatch.setattr(_se, "_HAS_NATIVE_SM3", False)
+        assert bytes(_se._sm3_hash(b"abc")).hex() == expected
+
+
+@pytest.mark.unit
+class Describe_custom_b64:
+    def test_should_match_standard_base64_with_padding(self):
+        """s0 表即标准 Base64。"""
+        assert _se._custom_b64("ab", "s0") == "YWI="
+
+    def test_should_fold_wide_chars_into_previous_bytes(self):
+        """码点超过 255 的字符高位并入同组前一字节，与 24 位打包一致。"""
+        assert _se._custom_b64("a\u0197b", "s0") == "YZdi"
+        assert _se._custom_b64("\u0197", "s0") == "lw=="
+
 
 @pytest.mark.unit
 class Describe_sign_xhs:
@@ -32,3 +32,28 @@ class Describe_TwitterExtractor:
         monkeypatch.setattr(clawkit.TwitterExtractor, "_try_fxtwitter", lambda *a, **k: fake)
         r = clawkit.TwitterExtractor().extract("https://x.com/a/status/1")
         assert r.media and r.media[0].url.startswith("http")
+
+    def test_graphql_variables_should_embed_tweet_id(self):
+        """预编码的 GraphQL variables 替换后应与逐次 json.dumps+quote 结果一致。"""
+        import json
+        from urllib.parse import quote
+        expected = quote(json.dumps({"tweetId": "123", "withCommunity": False, "includePromotedContent": False, "withVoice": False}))
+        assert clawkit.TwitterExtractor._GRAPHQL_VARIABLES_Q.replace("__TID__", "123") == expected
+
+    def test_guest_token_should_be_reused_until_stale(self, monkeypatch):
+        """guest token 应在 TTL 内复用，被拒绝后才重新激活。"""
+        tokens = iter(["t1", "t2"])
+        posts = []
+
+        class Client:
+            def post(self, url, **kwargs):
+                posts.append(url)
+                return clawkit.httpx.Response(200, json={"guest_token": next(tokens)})
+
+        monkeypatch.setattr(clawkit.TwitterExtractor, "_GUEST_TOKEN", None)
+        ex = clawkit.TwitterExtractor()
+        assert ex._get_guest_token(Client()) == "t1"
+        assert ex._get_guest_token(Client()) == "t1"
+        assert len(posts) == 1
+        assert ex._get_guest_token(Client(), stale="t1") == "t2"
+        assert len(posts) == 2
@@ -1,5 +1,7 @@
 import json
 import subprocess
+import sys
+import types
 
 import pytest
 
@@ -12,12 +14,14 @@ class Describe_YoutubeExtractor:
         """yt-dlp 返回 JSON 时应正确组装结果。"""
         payload = {"id": "x", "title": "yt", "description": "desc", "uploader": "u", "view_count": 1, "url": "https://v"}
         cp = subprocess.CompletedProcess(args=[], returncode=0, stdout=json.dumps(payload), stderr="")
+        monkeypatch.setitem(sys.modules, "yt_dlp", None)  # force the CLI path
         monkeypatch.setattr(subprocess, "run", lambda *a, **k: cp)
         r = clawkit.YoutubeExtractor().extract("https://youtu.be/x")
         assert r.title == "yt" and r.author.nickname == "u"
 
     def test_should_raise_when_ytdlp_not_installed(self, monkeypatch):
         """未安装 yt-dlp 时应给出明确错误。"""
+        monkeypatch.setitem(sys.modules, "yt_dlp", None)
         monkeypatch.setattr(subprocess, "run", lambda *a, **k: (_ for _ in ()).throw(FileNotFoundError()))
         with pytest.raises(ValueError, match="yt-dlp"):
             clawkit.YoutubeExtractor().extract("https://youtu.be/x")
@@ -25,6 +29,57 @@ class Describe_YoutubeExtractor:
     def test_should_raise_when_ytdlp_fails(self, monkeypatch):
         """yt-dlp 执行失败时应抛出错误。"""
         cp = subprocess.CompletedProcess(args=[], returncode=1, stdout="", stderr="boom")
+        monkeypatch.setitem(sys.modules, "yt_dlp", None)
         monkeypatch.setattr(subprocess, "run", lambda *a, **k: cp)
         with pytest.raises(ValueError, match="yt-dlp"):
             clawkit.YoutubeExtractor().extract("https://youtu.be/x")
+
+    def test_extract_should_use_in_process_ytdlp(self, monkeypatch):
+        """安装了 yt_dlp 包时，元数据应走进程内 API，且同一线程复用 YoutubeDL 实例。"""
+        created = []
+
+        class FakeYDL:
+            def __init__(self, opts):
+                created.append(opts)
+
+            def extract_info(self, url, download):
+                assert download is False
+                return {"id": url[-1], "title": "yt", "uploader": "u", "view_count": 3}
+
+            def sanitize_info(self, info):
+                return info
+
+        fake = types.ModuleType("yt_dlp")
+        fake.YoutubeDL = FakeYDL
+        monkeypatch.setitem(sys.modules, "yt_dlp", fake)
+        monkeypatch.setattr(subprocess, "run", lambda *a, **k: pytest.fail("should not spawn yt-dlp"))
+        r1 = clawkit.YoutubeExtractor().extract("https://youtu.be/a")
+        r2 = clawkit.YoutubeExtractor().extract("https://youtu.be/b")
+        assert (r1.raw_id, r2.raw_id) == ("a", "b") and r1.stats.views == 3
+        assert len(created) == 1
+
+    def test_download_should_use_in_process_ytdlp(self, monkeypatch, tmp_path):
+        """安装了 yt_dlp 包时，下载应走进程内 API 而非子进程。"""
+        target = tmp_path / "youtube_x.mp4"
+
+        class FakeYDL:
+            def __init__(self, opts):
+                assert opts["outtmpl"].endswith("youtube_x.%(ext)s")
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def extract_info(self, url, download):
+                target.write_bytes(b"v")
+                return {"requested_downloads": [{"filepath": str(target)}]}
+
+        fake = types.ModuleType("yt_dlp")
+        fake.YoutubeDL = FakeYDL
+        fake.utils = types.SimpleNamespace(DownloadError=RuntimeError)
+        monkeypatch.setitem(sys.modules, "yt_dlp", fake)
+        monkeypatch.setattr(subprocess, "run", lambda *a, **k: pytest.fail("should not spawn yt-dlp"))
+        r = clawkit.ExtractResult(platform="youtube", raw_id="x", url="https://youtu.be/x")
+        assert clawkit.download_media(r, str(tmp_path)) == [str(target)]
@@ -15,6 +15,15 @@ class Describe_ZhihuExtractor:
         r = clawkit.ZhihuExtractor()._parse_initial_data(data, "article", "10", "https://zhuanlan.zhihu.com/p/10")
         assert r.title == "知乎文章" and r.author.nickname == "作者"
 
+    def test_should_strip_and_truncate_long_answer(self):
+        """长回答应去除标签并截断到 500 字。"""
+        body = "<p>段落<b>加粗</b></p>" * 200
+        data = {"initialState": {"entities": {"answers": {"30": {
+            "content": body, "author": {}, "question": {"title": "Q"}
+        }}}}}
+        r = clawkit.ZhihuExtractor()._parse_initial_data(data, "answer", "30", "https://www.zhihu.com/answer/30")
+        assert r.description == ("段落加粗" * 200)[:500]
+
     def test_should_raise_cookie_hint_when_api_fails(self, monkeypatch):
         """API 失败时应抛出包含 cookie 提示的异常。"""
         monkeypatch.setattr(clawkit, "_client", lambda *a, **k: object())